@@ -0,0 +1,142 @@
+# coding: utf-8
+"""
+Modules/boca_cache.py
+
+Cache LRU de odontogramas ya resueltos, por (idBoca, modo de filtro).
+
+Cada entrada guarda todo lo que hace falta para mostrar la boca sin ir
+a la BD: los datos del encabezado, los estados parseados (sin filtrar),
+los estados filtrados y el `OdontogramState` resuelto.  El modelo se
+guarda **por referencia** y queda congelado: nadie lo muta
+(`OdontogramView.freeze_model` / `restore` trabajan con copy-on-write),
+así guardar y restaurar no copian las 52 piezas.
+
+    cache = BocaCache(max_entries=16, max_kb=512)
+    snap = cache.get(idboca, modo)          # antes de consultar la BD
+    if snap is None:
+        data = get_odontograma_data(idboca)
+        …
+        cache.put(idboca, modo, view.freeze_model(), view.states,
+                  data=data, raw=raw_states)
+
+Sin Qt: se puede usar y medir sin QApplication.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Tuple
+
+from Modules.odontogram_state import OdontogramState
+
+StateTuple = Tuple[int, int, str]
+
+
+class BocaSnapshot(NamedTuple):
+    model: OdontogramState            # congelado: no mutar (ver OdontogramView.restore)
+    states: Tuple[StateTuple, ...]    # estados visibles (filtrados)
+    nbytes: int                       # tamaño aproximado (objetos Python)
+    data: Dict[str, str]              # encabezado de get_odontograma_data
+    raw: Tuple[StateTuple, ...]       # estados parseados, sin filtrar
+
+
+def _approx_nbytes(model: OdontogramState, states: Tuple[StateTuple, ...],
+                   data: Dict[str, str], raw: Tuple[StateTuple, ...]) -> int:
+    """Estimación del tamaño de una entrada (sys.getsizeof, sin compartidos)."""
+    size = (sys.getsizeof(model.teeth) + sys.getsizeof(states)
+            + sys.getsizeof(data) + sys.getsizeof(raw))
+    for t in model.teeth.values():
+        size += (sys.getsizeof(t) + sys.getsizeof(t.faces)
+                 + sys.getsizeof(t.labels_red) + sys.getsizeof(t.labels_blue))
+    for s in states:
+        size += sys.getsizeof(s)
+    for s in raw:
+        size += sys.getsizeof(s)
+    for v in data.values():
+        size += sys.getsizeof(v)
+    return size
+
+
+class BocaCache:
+    """LRU acotado por cantidad de entradas y por memoria aproximada."""
+
+    def __init__(self, max_entries: int = 16, max_kb: int = 512) -> None:
+        self.max_entries = max(0, max_entries)
+        self.max_bytes = max(0, max_kb) * 1024
+        self._entries: "OrderedDict[Tuple[int, Hashable], BocaSnapshot]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Tuple[int, Hashable]) -> bool:
+        """`(idboca, modo) in cache` – sin tocar el orden LRU ni las métricas."""
+        return key in self._entries
+
+    def get(self, idboca: int, mode: Hashable) -> BocaSnapshot | None:
+        key = (idboca, mode)
+        snap = self._entries.get(key)
+        if snap is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return snap
+
+    def put(self, idboca: int, mode: Hashable, model: OdontogramState,
+            states: Iterable[StateTuple], *, data: Dict[str, str] | None = None,
+            raw: Iterable[StateTuple] = ()) -> BocaSnapshot:
+        """
+        Guarda la entrada; `model` se guarda sin copiar y no debe mutarse
+        después (usar `OdontogramView.freeze_model()`).  Devuelve la entrada.
+        """
+        frozen, raw_t, data = tuple(states), tuple(raw), dict(data or {})
+        snap = BocaSnapshot(model, frozen, _approx_nbytes(model, frozen, data, raw_t),
+                            data, raw_t)
+        key = (idboca, mode)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.nbytes
+        if self.max_entries and snap.nbytes <= self.max_bytes:
+            self._entries[key] = snap
+            self._bytes += snap.nbytes
+            self._trim()
+        return snap
+
+    def invalidate(self, idboca: int | None = None) -> int:
+        """Descarta las entradas de `idboca` (o todas); devuelve cuántas."""
+        keys: List[Tuple[int, Hashable]] = [
+            k for k in self._entries if idboca is None or k[0] == idboca
+        ]
+        for k in keys:
+            self._bytes -= self._entries.pop(k).nbytes
+        return len(keys)
+
+    def _trim(self) -> None:
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or self._bytes > self.max_bytes):
+            _key, snap = self._entries.popitem(last=False)
+            self._bytes -= snap.nbytes
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Métricas del cache (para logs y benchmarks)."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "kb": self._bytes / 1024,
+            "max_kb": self.max_bytes / 1024,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def report(self) -> str:
+        s = self.stats()
+        return (f"bocas en cache {s['entries']}/{s['max_entries']} · "
+                f"{s['kb']:.1f}/{s['max_kb']:.0f} KB · "
+                f"hits {s['hits']} · misses {s['misses']} · desalojos {s['evictions']}")
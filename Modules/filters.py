@@ -0,0 +1,153 @@
+# coding: utf-8
+"""
+Modules/filters.py
+
+Motor de filtros del odontograma: los predicados se **compilan** a tres
+bitmasks (códigos de estado, piezas FDI y caras) y se evalúan sobre los
+estados parseados ya empaquetados en arrays planos.
+
+    arr = pack(raw_states)                          # una vez por boca
+    flt = compile_filter(mode=MODE_REQUERIDAS, arch=ARCH_UPPER)
+    visibles = run(flt, arr)                        # [(cod, pieza, caras), …]
+
+    modos = precompute_modes(arr)                   # {MODE_TODOS: […], …}
+
+Sin Qt: también sirve para exportadores y pruebas.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+from Modules.utils import FACE_MAP, MAX_STATE, REQUERIDAS_MASK, state_mask
+from Modules.tooth_index import FDI_NUMBERS, teeth_where
+from Modules.odontogram_state import FACE_INDEX, FACE_NAMES
+
+StateTuple = Tuple[int, int, str]
+
+# Modos de los radios de MainWindow (id del QButtonGroup)
+MODE_TODOS, MODE_EXISTENTES, MODE_REQUERIDAS = range(3)
+MODES: Tuple[int, ...] = (MODE_TODOS, MODE_EXISTENTES, MODE_REQUERIDAS)
+
+ALL_STATES: int = (1 << (MAX_STATE + 1)) - 1
+ALL_TEETH: int = state_mask(FDI_NUMBERS)            # bit n = pieza FDI n
+ALL_FACES: int = (1 << len(FACE_NAMES)) - 1
+
+
+def faces_mask(faces: str) -> int:
+    """
+    Letras de caras (M, D, V, …) → bits de FACE_NAMES; "" = pieza entera.
+    Sin ninguna letra válida (p. ej. "X") da 0, como el modelo, que no
+    pinta ninguna cara.
+    """
+    if not faces:
+        return ALL_FACES
+    mask = 0
+    for c in faces.upper():
+        name = FACE_MAP.get(c)
+        if name:
+            mask |= 1 << FACE_INDEX[name]
+    return mask
+
+
+# ─────────────────────────────────────────────────────────────
+# Estados empaquetados
+# ─────────────────────────────────────────────────────────────
+class StateArrays(NamedTuple):
+    """Estados de una boca en arrays paralelos (mismo índice)."""
+    codes: array                  # 'b' – código de estado
+    teeth: array                  # 'b' – número FDI
+    faces: array                  # 'b' – bits de caras (ALL_FACES si no hay)
+    states: Tuple[StateTuple, ...]
+
+
+def pack(states: Iterable[StateTuple]) -> StateArrays:
+    lst = tuple(states)
+    return StateArrays(
+        array("b", (s[0] for s in lst)),
+        array("b", (s[1] for s in lst)),
+        array("b", (faces_mask(s[2]) for s in lst)),
+        lst,
+    )
+
+
+# ─────────────────────────────────────────────────────────────
+# Filtros compilados
+# ─────────────────────────────────────────────────────────────
+class Filter(NamedTuple):
+    states: int = ALL_STATES      # bit n = código n
+    teeth: int = ALL_TEETH        # bit n = pieza FDI n
+    faces: int = ALL_FACES        # alguna cara en común
+
+    @property
+    def is_all(self) -> bool:
+        return self == _ALL
+
+
+_ALL = Filter()
+
+_MODE_STATES: Dict[int, int] = {
+    MODE_TODOS:      ALL_STATES,
+    MODE_EXISTENTES: ALL_STATES & ~REQUERIDAS_MASK,
+    MODE_REQUERIDAS: REQUERIDAS_MASK,
+}
+
+
+def compile_filter(
+    *,
+    mode: int = MODE_TODOS,
+    codes: Iterable[int] | None = None,
+    arch: str | None = None,
+    quadrant: int | None = None,
+    primary: bool | None = None,
+    faces: str | None = None,
+) -> Filter:
+    """
+    Compila los criterios (todos deben cumplirse) a un `Filter`.
+    · mode      – radios de la UI (MODE_TODOS / _EXISTENTES / _REQUERIDAS)
+    · codes     – conjunto de códigos de estado
+    · arch, quadrant, primary – como `tooth_index.teeth_where`
+    · faces     – letras de caras; un estado sin caras ocupa la pieza entera
+
+    ValueError si `faces` no tiene ninguna letra de cara válida.
+    """
+    st = _MODE_STATES[mode]
+    if codes is not None:
+        st &= state_mask(codes)
+    teeth = ALL_TEETH
+    if arch is not None or quadrant is not None or primary is not None:
+        teeth = state_mask(teeth_where(arch=arch, quadrant=quadrant, primary=primary))
+    fm = faces_mask(faces) if faces else ALL_FACES
+    if not fm:
+        raise ValueError(f"Caras sin letras válidas: {faces!r}")
+    return Filter(st, teeth, fm)
+
+
+def select(flt: Filter, arr: StateArrays) -> List[int]:
+    """Índices de `arr` que pasan `flt`."""
+    if flt.is_all:
+        return list(range(len(arr.states)))
+    sm, tm, fm = flt
+    if fm == ALL_FACES:                  # sin filtro de caras
+        return [i for i, (c, t) in enumerate(zip(arr.codes, arr.teeth))
+                if sm >> c & 1 and tm >> t & 1]
+    return [i for i, (c, t, f) in enumerate(zip(arr.codes, arr.teeth, arr.faces))
+            if sm >> c & 1 and tm >> t & 1 and f & fm]
+
+
+def run(flt: Filter, arr: StateArrays) -> List[StateTuple]:
+    """Estados de `arr` que pasan `flt`, en el orden original."""
+    if flt.is_all:
+        return list(arr.states)
+    states = arr.states
+    return [states[i] for i in select(flt, arr)]
+
+
+def precompute_modes(arr: StateArrays) -> Dict[int, List[StateTuple]]:
+    """Resultado de cada modo de la UI en una sola pasada por los estados."""
+    req: List[StateTuple] = []
+    ex: List[StateTuple] = []
+    for c, s in zip(arr.codes, arr.states):
+        (req if REQUERIDAS_MASK >> c & 1 else ex).append(s)
+    return {MODE_TODOS: list(arr.states), MODE_EXISTENTES: ex, MODE_REQUERIDAS: req}
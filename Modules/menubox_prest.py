@@ -8,6 +8,7 @@ from __future__ import annotations
 from typing import Callable, Dict, Optional, Set
 
 from Modules.menu_estados import MenuEstados
+from Modules.utils import ESTADOS_POR_NUM, REQUERIDAS_CODES
 
 # ───────── base de iconos ──────────────────────────────────
 _PROTESIS_BASE = {
@@ -33,7 +34,8 @@ _OTHER_ICONS = {
 _PROTESIS_B = {f"{k}_B" for k in _PROTESIS_BASE}
 _PROTESIS_R = {f"{k}_R" for k in _PROTESIS_BASE}
 
-REQUERIDAS_FULL_SET: Set[str] = _PROTESIS_B | {"Caries", "Extracción"}
+# nombres visibles de Modules.utils.REQUERIDAS_CODES (la fuente es el código)
+REQUERIDAS_FULL_SET: Set[str] = {ESTADOS_POR_NUM[c] for c in REQUERIDAS_CODES}
 _EXISTENTES_EXCLUDE: Set[str] = {"Supernumerario"} | REQUERIDAS_FULL_SET
 
 # ───────── helpers ─────────────────────────────────────────
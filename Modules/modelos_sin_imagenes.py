@@ -6,95 +6,315 @@ Modules/modelos_sin_imagenes.py
 Odontograma sin imágenes – versión **completa y actualizada**.
 · Filas centradas horizontalmente respecto al ancho máximo
 · Espaciado vertical configurable con TOP_PADDING y BETWEEN_ROWS_EXTRA
+  (Modules.utils; las coordenadas salen de Modules.tooth_index)
+· Un único QGraphicsItem por pieza: caras, overlays y rótulos se pintan
+  en un solo `paint()` desde QPainterPath cacheados.
+· Esqueleto compartido: caras en blanco, contornos y números de todas las
+  piezas se graban una vez en un QPicture (por tamaño) que reutilizan
+  todas las vistas; cada pieza pinta sólo lo que difiere de “en blanco”.
 · Prótesis:
     – Mantiene listas independientes de etiquetas rojas y azules
     – Nunca descarta un rótulo (acumula)
-    – El bloque azul se renderiza siempre por encima del rojo
+    – Un item por fila, código y tramo contiguo de piezas (llave +
+      rótulo); los tramos que se superponen van en carriles, siempre
+      por debajo de los números de la fila de arriba
 """
 
 from __future__ import annotations
 
-from collections import defaultdict
-from typing import Callable, Dict, List, Tuple, cast
+import math
+from contextlib import contextmanager
+from functools import cached_property
+from typing import Dict, Hashable, Iterable, Iterator, List, Tuple, cast
 
-from PyQt5.QtCore import QPointF, Qt
-from PyQt5.QtGui import QBrush, QFont, QPen, QPolygonF
+from PyQt5.QtCore import QPoint, QPointF, QRectF, QSizeF, Qt
+from PyQt5.QtGui import (
+    QPainter, QPainterPath, QPicture, QPixmap, QPolygonF, QTransform,
+)
 from PyQt5.QtWidgets import (
-    QGraphicsEllipseItem,
+    QGraphicsItem,
     QGraphicsLineItem,
-    QGraphicsPolygonItem,
     QGraphicsScene,
-    QGraphicsTextItem,
     QGraphicsView,
 )
 
 # Configuración y mapeos -------------------------------------------------------
 from Modules.utils import (
-    ESTADOS_POR_NUM,
-    PROTESIS_SHORT,
-    TEETH_ROWS,
-    Y_POSITIONS,
+    ESTADOS,
+    Estado,
     TOOTH_SIZE,
-    TOOTH_MARGIN,
-    FACE_MAP,
+    TOP_PADDING,          # re-exportados: antes se definían aquí
+    BETWEEN_ROWS_EXTRA,
+)
+from Modules.tooth_index import LAYOUT, ROW_OF
+from Modules import tooth_geometry as tg
+from Modules.odontogram_state import (
+    FACE_NAMES,
+    FILL_WHITE, FILL_RED, FILL_BLUE, FILL_GRAY,
+    LINES_NONE, LINES_PD,
+    OV_CORONA, OV_IMPLANTE, OV_SELLADOR, OV_AUSENTE, OV_SUPER,
+    OdontogramState,
+    ToothState,
 )
+from Utils.sp_data_parse import canonical_states, encode_dientes
+from Modules.filters import faces_mask          # letras de caras → bits de FACE_NAMES
 
 # Paleta gráfica ---------------------------------------------------------------
 from Styles.style_models import (
-    BLUE, YELLOW, WHITE, BLACK,
-    RED, DARK_GRAY,
-    BLUE_PEN, YELLOW_PEN, DOT_BLUE_PEN, BRIDGE_PEN,
-    WHITE_BRUSH, BLUE_BRUSH, YELLOW_BRUSH, TRANSPARENT_BRUSH,
+    BLUE_PEN, WHITE_BRUSH, BLUE_BRUSH, TRANSPARENT_BRUSH,
+    brush, font, pen,
 )
+# Rótulos: QStaticText + métricas cacheadas por (texto, fuente)
+from Styles.text_cache import static_text, text_metrics
+# Cache por item, modo de actualización, flags e índice (ODONTO_RENDER_PROFILE)
+from Styles.render_profile import PROFILES, profile_name
 
 # -------- pinceles / bolígrafos auxiliares ------------------------------------
-RED_BRUSH  = QBrush(RED)
-RED_PEN    = QPen(RED, 2)
-DOT_RED_PEN = QPen(RED, 2, Qt.DotLine)                    # type: ignore[attr-defined]
-RED_BRIDGE_PEN = QPen(RED, 3)
+# (copias del registro de Styles.style_models; Qt comparte los datos)
+RED_BRUSH  = brush("red")
+RED_PEN    = pen("red")
+DOT_RED_PEN = pen("red_dot")
+RED_BRIDGE_PEN = pen("red_bridge")
+PD_LINE_PEN = pen("pd_line")
+OUTLINE_PEN = pen("outline")
+TEXT_BLACK_PEN = pen("text_black")
+TEXT_RED_PEN   = pen("text_red")
+TEXT_BLUE_PEN  = pen("text_blue")
+PROT_RED_PEN   = pen("prot_red")
+PROT_BLUE_PEN  = pen("prot_blue")
+
+# -------- tipografías ----------------------------------------------------------
+NUM_FONT  = font("tooth_number")
+IMP_FONT  = font("implant")
+SUP_FONT  = font("supernum")
+PROT_FONT = font("prosthesis")
+TEXT_MARGIN = 4          # margen que usaba QGraphicsTextItem (documentMargin)
+
+# Cara → letra canónica (inversa de FACE_MAP) ----------------------------------
+_FACE_LETTER = {"left": "M", "right": "D", "top": "V", "bottom": "L", "center": "O"}
+
+_BLANK = ToothState()    # estado inicial compartido; nunca se muta
+
+_FILL_BRUSH = {
+    FILL_WHITE: WHITE_BRUSH,
+    FILL_RED:   RED_BRUSH,
+    FILL_BLUE:  BLUE_BRUSH,
+    FILL_GRAY:  brush("gray"),
+}
 
-# Espaciado vertical -----------------------------------------------------------
-TOP_PADDING        = -10
-BETWEEN_ROWS_EXTRA = 60
 
 # ─────────────────────────────────────────────────────────────
-# Cara individual de diente
+# Geometría compartida (coordenadas locales de la pieza)
 # ─────────────────────────────────────────────────────────────
-class ToothFacePolygon(QGraphicsPolygonItem):
-    _selected: bool
+class _ToothGeometry:
+    """QPainterPath de caras y overlays para piezas de lado `s` (se cachea)."""
 
-    def __init__(self, pts: List[Tuple[float, float]], parent: "ToothItem") -> None:
-        super().__init__(QPolygonF([QPointF(x, y) for x, y in pts]))
-        self.tooth = parent
-        self.setBrush(WHITE_BRUSH)
-        self.setPen(QPen(BLACK, 2))
-        self._selected = False
+    _cache: Dict[int, "_ToothGeometry"] = {}
 
-    # ------------------------------------------------------------------
-    def mousePressEvent(self, event):  # type: ignore[override]
-        view = self.tooth.odontogram_view
-        if view.locked:
-            return
+    @classmethod
+    def get(cls, s: int) -> "_ToothGeometry":
+        geo = cls._cache.get(s)
+        if geo is None:
+            geo = cls._cache[s] = cls(s)
+        return geo
 
-        state = view.current_state
-        if state == "Obturacion":
-            self._selected = not self._selected
-            self.setBrush(BLUE_BRUSH if self._selected else WHITE_BRUSH)
-        elif state == "Puente":
-            self.tooth.has_bridge = not self.tooth.has_bridge
-            view.update_bridges()
-        else:
-            self.tooth.apply_state(state)
-        super().mousePressEvent(event)
+    def __init__(self, s: int) -> None:
+        fs = s / 3  # “face size”
+        self.s, self.fs = s, fs
+        polys = tg.FACE_POLYS if s == TOOTH_SIZE else tg.face_polys(s)
+        self.square = QRectF(0, 0, s, s)
+        self.faces: List[QPolygonF] = [
+            QPolygonF([QPointF(x, y) for x, y in pts]) for pts in polys
+        ]
+
+        # contorno de las 5 caras en un solo trazo
+        self.outline = QPainterPath()
+        self.outline.addRect(self.square)
+        self.outline.addRect(QRectF(fs, fs, s - 2 * fs, s - 2 * fs))
+        for (x0, y0), (x1, y1) in tg.outline_diagonals(s):
+            self.outline.moveTo(x0, y0)
+            self.outline.lineTo(x1, y1)
+
+    # ----- overlays: se construyen la primera vez que un estado los pide -----
+    @cached_property
+    def cross(self) -> QPainterPath:
+        s = self.s
+        path = QPainterPath()
+        path.moveTo(0, 0)
+        path.lineTo(s, s)
+        path.moveTo(s, 0)
+        path.lineTo(0, s)
+        return path
+
+    @cached_property
+    def corona(self) -> QPainterPath:
+        return self._circle("corona")
+
+    @cached_property
+    def sellador(self) -> QPainterPath:
+        return self._circle("sellador")
+
+    @cached_property
+    def ausente(self) -> QPainterPath:
+        return self._circle("ausente")
+
+    @cached_property
+    def super_circ(self) -> QPainterPath:
+        return self._circle("super")
+
+    @cached_property
+    def imp_pos(self) -> QPointF:
+        return QPointF(5 + TEXT_MARGIN, 5 + TEXT_MARGIN)
+
+    @cached_property
+    def super_pos(self) -> QPointF:
+        m = text_metrics("S", SUP_FONT)
+        return QPointF((self.s - m.width) / 2, (self.s - m.height) / 2)
+
+    def _circle(self, name: str) -> QPainterPath:
+        path = QPainterPath()
+        path.addEllipse(QRectF(*tg.circle_rect(self.s, tg.OVERLAY_RATIOS[name])))
+        return path
+
+    def face_at(self, x: float, y: float) -> str | None:
+        """Cara bajo el punto local (x, y), o None si cae fuera de la pieza."""
+        idx = tg.face_at(x, y, self.s)
+        return FACE_NAMES[idx] if idx >= 0 else None
+
+    def num_pos(self, num: str) -> QPointF:
+        """Esquina sup. izq. del número de pieza (centrado bajo el cuadrado)."""
+        nx, ny = tg.num_anchor(self.s)
+        return QPointF(nx - text_metrics(num, NUM_FONT).width / 2, ny + TEXT_MARGIN)
+
+
+# ─────────────────────────────────────────────────────────────
+# Esqueleto compartido (piezas en blanco)
+# ─────────────────────────────────────────────────────────────
+_SKELETONS: Dict[int, QPicture] = {}
+
+
+def skeleton_picture(size: int = TOOTH_SIZE) -> QPicture:
+    """
+    Capa inmutable del odontograma en coordenadas de escena: caras
+    blancas, contornos y números de todas las piezas de LAYOUT.  Se graba
+    una sola vez por tamaño y la comparten todas las vistas; al ser
+    vectorial sirve para cualquier escala.
+    """
+    pic = _SKELETONS.get(size)
+    if pic is not None:
+        return pic
+    geo = _ToothGeometry.get(size)
+    pic = QPicture()
+    p = QPainter(pic)
+    p.setFont(NUM_FONT)
+    bounds = QRectF()
+    for row in LAYOUT:
+        for info in row:
+            num = str(info.num)
+            m = text_metrics(num, NUM_FONT)
+            bounds = bounds.united(
+                QRectF(info.x, info.y, size, size)
+                .united(QRectF(geo.num_pos(num) + QPointF(info.x, info.y),
+                               QSizeF(m.width, m.height))))
+            p.save()
+            p.translate(info.x, info.y)
+            p.fillRect(geo.square, WHITE_BRUSH)
+            p.setPen(OUTLINE_PEN)
+            p.setBrush(Qt.NoBrush)  # type: ignore[attr-defined]
+            p.drawPath(geo.outline)
+            p.setPen(TEXT_BLACK_PEN)
+            p.drawStaticText(geo.num_pos(num), static_text(num, NUM_FONT))
+            p.restore()
+    p.end()
+    # QPicture no cuenta el alto del texto: límites explícitos (+ pluma)
+    pic.setBoundingRect(bounds.adjusted(-2, -2, 2, 2).toAlignedRect())
+    _SKELETONS[size] = pic
+    return pic
+
+
+# Pixmaps del esqueleto ya rasterizados, compartidos entre vistas:
+# (id del QPicture, escala x, escala y, fracción de desplazamiento x, y)
+#     → (pixmap, offset entero respecto del desplazamiento de la vista)
+_SKELETON_PIXMAPS: Dict[Tuple[int, float, float, float, float], Tuple[QPixmap, QPoint]] = {}
+_SKELETON_PIXMAPS_MAX = 8
+
+
+def _skeleton_pixmap(pic: QPicture, bounds: QRectF,
+                     t: QTransform) -> Tuple[QPixmap, QPoint]:
+    """
+    Rasteriza `pic` con la transformación `t` (cacheado por escala).
+    `SkeletonItem` sólo lo usa con escala y traslación enteras.
+    """
+    fx, fy = math.floor(t.dx()), math.floor(t.dy())
+    key = (id(pic), t.m11(), t.m22(), t.dx() - fx, t.dy() - fy)
+    hit = _SKELETON_PIXMAPS.get(key)
+    if hit is not None:
+        return hit
+    frac = QTransform(t.m11(), 0, 0, t.m22(), key[3], key[4])
+    dev = frac.mapRect(bounds).toAlignedRect()
+    pix = QPixmap(dev.size())
+    pix.fill(Qt.transparent)  # type: ignore[attr-defined]
+    p = QPainter(pix)
+    p.setTransform(frac * QTransform.fromTranslate(-dev.x(), -dev.y()))
+    p.drawPicture(0, 0, pic)
+    p.end()
+    if len(_SKELETON_PIXMAPS) >= _SKELETON_PIXMAPS_MAX:
+        _SKELETON_PIXMAPS.clear()
+    hit = _SKELETON_PIXMAPS[key] = (pix, dev.topLeft())
+    return hit
+
+
+class SkeletonItem(QGraphicsItem):
+    """
+    Capa de fondo con el esqueleto compartido (`skeleton_picture`).
+
+    Con escala entera y traslación en píxeles enteros (el caso habitual,
+    1:1) se pinta como un pixmap ya rasterizado y compartido entre vistas,
+    así un repintado parcial es un blit y no la reproducción de las 52
+    piezas; el resultado es idéntico píxel a píxel.  Con escalas
+    fraccionarias (p. ej. 0.8 en pantallas chicas), rotaciones o Hi-DPI
+    el blit no garantiza el mismo antialiasing y se reproduce el QPicture.
+    """
+
+    def __init__(self, picture: QPicture) -> None:
+        super().__init__()
+        self._pic = picture
+        self._bounds = QRectF(picture.boundingRect())
+        self.setZValue(-1)
+        self.setAcceptedMouseButtons(Qt.NoButton)  # type: ignore[attr-defined]
+
+    def boundingRect(self) -> QRectF:  # type: ignore[override]
+        return self._bounds
+
+    def paint(self, painter: QPainter, option, widget=None) -> None:  # type: ignore[override]
+        t = painter.worldTransform()
+        dev = painter.device()
+        if (t.type() > QTransform.TxScale
+                or not all(float(v).is_integer() for v in (t.m11(), t.m22(), t.dx(), t.dy()))
+                or (dev is not None and dev.devicePixelRatioF() != 1)):
+            painter.drawPicture(0, 0, self._pic)
+            return
+        pix, off = _skeleton_pixmap(self._pic, self._bounds, t)
+        painter.save()
+        painter.resetTransform()
+        painter.drawPixmap(math.floor(t.dx()) + off.x(), math.floor(t.dy()) + off.y(), pix)
+        painter.restore()
 
 
 # ─────────────────────────────────────────────────────────────
 # Pieza dental completa
 # ─────────────────────────────────────────────────────────────
-class ToothItem:
+class ToothItem(QGraphicsItem):
     """
-    Pieza dental con todas sus caras, overlays y estados.
-    Soporta múltiples prótesis rojas y azules.
+    Pieza dental: un solo QGraphicsItem que pinta caras y overlays en
+    `paint()`.  Caras blancas, contorno y número ya están en el esqueleto
+    compartido (`skeleton_picture`): una pieza en blanco no pinta nada.
+    Los rótulos de prótesis los dibuja la vista por tramo
+    (`ProsthesisArchItem`).
+
+    Es sólo el *renderer* de un `ToothState` (Modules.odontogram_state):
+    `sync()` compara con lo mostrado y, si algo cambió, pide un repintado.
+    El modelo vive en `view.model`.
     """
     def __init__(
         self,
@@ -105,333 +325,701 @@ class ToothItem:
         view: "OdontogramView",
         num: str,
     ) -> None:
-        self._scene = scene
+        super().__init__()
         self.odontogram_view = view
         self.size = size
         self.num = num
-        self.has_bridge = False
+        self.rect = QRectF(x, y, size, size)   # en coordenadas de escena
+        self._geo = _ToothGeometry.get(size)
+        self._shown = _BLANK                   # lo que está en pantalla (por referencia)
+        pad = size * 0.05 + 2                  # corona + grosor de pluma
+        self._bounds = QRectF(-pad, -pad, size + 2 * pad, size + 2 * pad)
 
-        self._create_faces(x, y, size)
-        self._create_overlays(x, y, size)
+        self.setPos(x, y)
+        scene.addItem(self)
 
-    # ------------------------- caras ----------------------
-    def _create_faces(self, x: int, y: int, s: int) -> None:
-        fs = s / 3  # “face size”
-        pts = {
-            "top":    [(x, y), (x + s, y), (x + s - fs, y + fs), (x + fs, y + fs)],
-            "right":  [(x + s, y), (x + s, y + s), (x + s - fs, y + s - fs), (x + s - fs, y + fs)],
-            "bottom": [(x + s, y + s), (x, y + s), (x + fs, y + s - fs), (x + s - fs, y + s - fs)],
-            "left":   [(x, y + s), (x, y), (x + fs, y + fs), (x + fs, y + s - fs)],
-            "center": [(x + fs, y + fs), (x + s - fs, y + fs), (x + s - fs, y + s - fs),
-                       (x + fs, y + s - fs)],
-        }
-        self.faces: Dict[str, ToothFacePolygon] = {
-            n: ToothFacePolygon(poly, self) for n, poly in pts.items()
-        }
-        for face in self.faces.values():
-            self._scene.addItem(face)
-
-    # ----------------------- overlays ----------------------
-    def _create_overlays(self, x: int, y: int, s: int) -> None:
-        # --- líneas cruzadas (por defecto azules) ------------
-        ln1 = cast(QGraphicsLineItem, self._scene.addLine(x, y, x + s, y + s, BLUE_PEN))
-        ln2 = cast(QGraphicsLineItem, self._scene.addLine(x + s, y, x, y + s, BLUE_PEN))
-        self.cross_lines = [ln1, ln2]
-        for ln in self.cross_lines:
-            ln.setVisible(False)
-
-        # --- corona -----------------------------------------
-        r = s * 1.1
-        self.corona = cast(
-            QGraphicsEllipseItem,
-            self._scene.addEllipse(
-                x + s / 2 - r / 2, y + s / 2 - r / 2, r, r, RED_PEN, TRANSPARENT_BRUSH
-            ),
-        )
-        self.corona.setVisible(False)
-
-        # --- implante ---------------------------------------
-        self.implante = cast(QGraphicsTextItem,
-                             self._scene.addText("IMP", QFont("Arial", 10, QFont.Bold)))
-        self.implante.setDefaultTextColor(RED)
-        self.implante.setPos(x + 5, y + 5)
-        self.implante.setVisible(False)
-
-        # --- sellador ---------------------------------------
-        sr = s * 0.2
-        self.sellador = cast(
-            QGraphicsEllipseItem,
-            self._scene.addEllipse(
-                x + s / 2 - sr / 2, y + s / 2 - sr / 2, sr, sr, RED_PEN, RED_BRUSH
-            ),
-        )
-        self.sellador.setVisible(False)
-
-        # --- ausente fisiológico -----------------------------
-        self.ausente_fisio = cast(
-            QGraphicsEllipseItem,
-            self._scene.addEllipse(
-                x + s / 2 - s / 2, y + s / 2 - s / 2, s, s, DOT_RED_PEN, TRANSPARENT_BRUSH
-            ),
-        )
-        self.ausente_fisio.setVisible(False)
-
-        # --- supernumerario ---------------------------------
-        sup_r = s * 0.4
-        cx, cy = x + s / 2 - sup_r / 2, y + s / 2 - sup_r / 2
-        self.super_num_circ = cast(
-            QGraphicsEllipseItem,
-            self._scene.addEllipse(cx, cy, sup_r, sup_r, BLUE_PEN, TRANSPARENT_BRUSH),
-        )
-        self.super_num_circ.setVisible(False)
-        self.super_num_text = cast(QGraphicsTextItem,
-                                   self._scene.addText("S", QFont("Arial", 12, QFont.Bold)))
-        self.super_num_text.setDefaultTextColor(BLACK)
-        self.super_num_text.setPos(
-            cx + sup_r / 2 - self.super_num_text.boundingRect().width() / 2,
-            cy + sup_r / 2 - self.super_num_text.boundingRect().height() / 2,
-        )
-        self.super_num_text.setVisible(False)
-
-        # --- prótesis (dos items, listas de labels) ----------
-        font = QFont("Arial", 12, QFont.Bold)
-        self.item_red  = cast(QGraphicsTextItem, self._scene.addText("", font))
-        self.item_red.setDefaultTextColor(RED)
-        self.item_red.setZValue(2)
-
-        self.item_blue = cast(QGraphicsTextItem, self._scene.addText("", font))
-        self.item_blue.setDefaultTextColor(BLUE)
-        self.item_blue.setZValue(3)
-
-        self.labels_red:  List[str] = []
-        self.labels_blue: List[str] = []
-
-        self.item_red.setVisible(False)
-        self.item_blue.setVisible(False)
-
-    # --------------- gestión de prótesis -------------------
-    def _add_protesis_label(self, label: str, *, blue: bool) -> None:
-        """Añade `label` a la lista roja o azul (sin duplicados)."""
-        lst = self.labels_blue if blue else self.labels_red
-        if label not in lst:
-            lst.append(label)
-            self._render_protesis()
-            print(f"[DBG]  Pieza {self.num}: +{label} ({'azul' if blue else 'roja'})")
-
-    def _render_protesis(self) -> None:
-        """Concatena y posiciona los bloques de prótesis sin solaparse."""
-        txt_red  = " ".join(self.labels_red)
-        txt_blue = " ".join(self.labels_blue)
-
-        self.item_red.setPlainText(txt_red)
-        self.item_blue.setPlainText(txt_blue)
-
-        self.item_red.setVisible(bool(txt_red))
-        self.item_blue.setVisible(bool(txt_blue))
-
-        top_rect = self.faces["top"].mapToScene(
-            self.faces["top"].boundingRect()).boundingRect()
-        cx = top_rect.center().x()
-        base_y = top_rect.top() - 5
-
-        h_red  = self.item_red.boundingRect().height()  if txt_red else 0
-        h_blue = self.item_blue.boundingRect().height() if txt_blue else 0
-
-        if txt_red:
-            w = self.item_red.boundingRect().width()
-            self.item_red.setPos(cx - w / 2, base_y - h_red)
-
-        if txt_blue:
-            w = self.item_blue.boundingRect().width()
-            offset = h_red + 4 if txt_red else 0
-            self.item_blue.setPos(cx - w / 2,
-                                  base_y - h_blue - offset)
+    @property
+    def state(self) -> ToothState:
+        """Estado del modelo para esta pieza."""
+        return self.odontogram_view.model.teeth[int(self.num)]
 
-    # -------------- métodos de estado ----------------------
-    def apply_state(self, name: str, *, code: int | None = None) -> None:
-        """
-        Aplica un estado.
-        · Prótesis → lista roja o azul (según sufijo o código).
-        """
-        # — obturación / caries —
-        if name in ("Obturacion", "Caries"):
-            brush = RED_BRUSH if name == "Obturacion" else BLUE_BRUSH
-            for face in self.faces.values():
-                face.setBrush(brush)
-            return
+    @property
+    def row(self) -> int:
+        """Fila del layout (0-3) donde está la pieza."""
+        return ROW_OF[int(self.num)]
+
+    @property
+    def has_bridge(self) -> bool:
+        return self.state.bridge
+
+    @has_bridge.setter
+    def has_bridge(self, value: bool) -> None:
+        st = self._writable()
+        st.bridge = value
+        self._shown = st                       # el puente no se pinta en la pieza
+
+    @property
+    def labels_red(self) -> List[str]:
+        return self.state.labels_red
+
+    @property
+    def labels_blue(self) -> List[str]:
+        return self.state.labels_blue
+
+    # ----------------------- QGraphicsItem -----------------
+    def boundingRect(self) -> QRectF:  # type: ignore[override]
+        return self._bounds
 
-        # — prótesis —
-        if name in PROTESIS_SHORT:
-            label = PROTESIS_SHORT[name]
-            blue = name.endswith("_B") or (code is not None and 16 <= code <= 19)
-            self._add_protesis_label(label, blue=blue)
+    def paint(self, painter: QPainter, option, widget=None) -> None:  # type: ignore[override]
+        st, geo = self._shown, self._geo
+
+        # caras no blancas: rellenos sin pluma y el contorno otra vez encima
+        faces = st.faces
+        if max(faces) != FILL_WHITE:
+            if min(faces) == max(faces):
+                painter.fillRect(geo.square, _FILL_BRUSH[faces[0]])
+            else:
+                painter.setPen(Qt.NoPen)  # type: ignore[attr-defined]
+                for poly, fill in zip(geo.faces, faces):
+                    if fill != FILL_WHITE:
+                        painter.setBrush(_FILL_BRUSH[fill])
+                        painter.drawPolygon(poly)
+            painter.setPen(OUTLINE_PEN)
+            painter.setBrush(Qt.NoBrush)  # type: ignore[attr-defined]
+            painter.drawPath(geo.outline)
+
+        # líneas cruzadas
+        if st.lines != LINES_NONE:
+            painter.setBrush(Qt.NoBrush)  # type: ignore[attr-defined]
+            painter.setPen(PD_LINE_PEN if st.lines == LINES_PD else BLUE_PEN)
+            painter.drawPath(geo.cross)
+
+        # overlays
+        ov = st.overlays
+        if ov:
+            painter.setBrush(TRANSPARENT_BRUSH)
+            if ov & OV_CORONA:
+                painter.setPen(RED_PEN)
+                painter.drawPath(geo.corona)
+            if ov & OV_IMPLANTE:
+                painter.setFont(IMP_FONT)
+                painter.setPen(TEXT_RED_PEN)
+                painter.drawStaticText(geo.imp_pos, static_text("IMP", IMP_FONT))
+            if ov & OV_SELLADOR:
+                painter.setPen(RED_PEN)
+                painter.setBrush(RED_BRUSH)
+                painter.drawPath(geo.sellador)
+                painter.setBrush(TRANSPARENT_BRUSH)
+            if ov & OV_AUSENTE:
+                painter.setPen(DOT_RED_PEN)
+                painter.drawPath(geo.ausente)
+            if ov & OV_SUPER:
+                painter.setPen(BLUE_PEN)
+                painter.drawPath(geo.super_circ)
+                painter.setFont(SUP_FONT)
+                painter.setPen(TEXT_BLACK_PEN)
+                painter.drawStaticText(geo.super_pos, static_text("S", SUP_FONT))
+
+    def mousePressEvent(self, event):  # type: ignore[override]
+        # OdontogramView resuelve sus clics con `hit_test` sin llegar aquí;
+        # esto cubre la escena mostrada en otra QGraphicsView.
+        face = self._geo.face_at(event.pos().x(), event.pos().y())
+        if self.odontogram_view.locked or face is None:
+            event.ignore()
             return
+        self.click(face)
+        event.accept()
 
-        # — otros estados (solo lo esencial; conserva los tuyos) —
-        handlers: Dict[str, Callable[[], None]] = {
-            "Ninguno":              self.reset,
-            "Agenesia":             lambda: self._shade_all(DARK_GRAY),
-            "PD Ausente":           lambda: self._set_lines(True, width=4),
-            "Corona":               lambda: self.corona.setVisible(True),
-            "Implante":             lambda: self.implante.setVisible(True),
-            "Selladores":           lambda: self.sellador.setVisible(True),
-            "Ausente Fisiológico":  lambda: self.ausente_fisio.setVisible(True),
-            "Supernumerario":       lambda: self._toggle_super(True),
-            "Puente":               self._flag_bridge,
-            "Extracción":           self._apply_extraccion,
-        }
-        if handler := handlers.get(name):
-            handler()
+    def click(self, face: str) -> None:
+        """Edición con el estado actual de la vista sobre la cara `face`."""
+        view = self.odontogram_view
+        code = view.current_code
+        if code == Estado.OBTURACION:
+            self.toggle_face(face)
+        elif code == Estado.PUENTE:
+            self.has_bridge = not self.has_bridge
+            view.update_bridges((self.row,))
         else:
-            print(f"[WARN] Estado no manejado: {name}")
+            self.apply_state(view.current_state, code=code)
+        view.record_edit(self, code)
+
+    # -------------- render incremental ---------------------
+    def sync(self, target: ToothState | None = None) -> int:
+        """
+        Lleva lo mostrado a `target` (por defecto, el estado del modelo).
+        Devuelve 1 si la pieza se invalidó para repintar, 0 si no cambió.
+        Puente y prótesis sólo se registran: sus items los maneja la vista
+        por fila (`update_bridges` / `update_prosthesis`).
+        """
+        if target is None:
+            target = self.state
+        # por referencia: quien edita la pieza la copia antes (`_writable`)
+        shown, self._shown = self._shown, target
+        if target is shown or target == shown:
+            return 0
+        view = self.odontogram_view
+        if view._batch_depth:
+            view._batch_dirty.append(self)         # un solo repintado al cerrar el lote
+        else:
+            self.update()
+        return 1
+
+    # -------------- métodos de estado ----------------------
+    def _writable(self) -> ToothState:
+        """
+        Estado de la pieza listo para mutar (copy-on-write): el modelo puede
+        estar compartido con BocaCache y `_shown` apunta al mismo objeto,
+        así que la pieza se copia antes de editarla.
+        """
+        teeth = self.odontogram_view._own_model().teeth
+        n = int(self.num)
+        st = teeth[n]
+        if st is self._shown:
+            st = teeth[n] = st.copy()
+        return st
+
+    def apply_state(self, name: str, *, code: int | None = None) -> None:
+        """Aplica un estado sobre el modelo y sincroniza la escena."""
+        st = self._writable()
+        had = (st.bridge, st.labels_red[:], st.labels_blue[:])
+        st.apply(name, code)
+        self.sync()
+        self._sync_row_items(had)
 
-    # --------- utilidades internas de ToothItem ------------
     def apply_obturation_faces(self, faces: str, state_name: str) -> None:
-        brush = RED_BRUSH if state_name == "Obturacion" else BLUE_BRUSH
-        for c in faces.upper():
-            face_name = FACE_MAP.get(c)
-            if face_name:
-                self.faces[face_name].setBrush(brush)
-
-    def _apply_extraccion(self) -> None:
-        self._set_lines(True)
-
-    def _shade_all(self, color) -> None:
-        brush = QBrush(color)
-        for f in self.faces.values():
-            f.setBrush(brush)
-            f.setPen(QPen(BLACK, 2))
-            f._selected = False
-
-    def _set_lines(self, visible: bool, *, width: int | None = None) -> None:
-        if width is not None:
-            pen = QPen(RED, width)
-            for l in self.cross_lines:
-                l.setPen(pen)
-        for l in self.cross_lines:
-            l.setVisible(visible)
-
-    def _toggle_super(self, enabled: bool) -> None:
-        self.super_num_circ.setVisible(enabled)
-        self.super_num_text.setVisible(enabled)
-
-    def _flag_bridge(self) -> None:
-        self.has_bridge = True
-        self.odontogram_view.update_bridges()
+        self._writable().apply(state_name, faces=faces)
+        self.sync()
+
+    def toggle_face(self, face_name: str) -> None:
+        """Clic de edición con “Obturacion”: alterna la cara roja/blanca."""
+        self._writable().toggle_face(face_name)
+        self.sync()
 
     def reset(self) -> None:
         """Restablece la pieza a su estado inicial."""
-        self._shade_all(WHITE)
-        self._set_lines(False)
-        for itm in (
-            self.corona, self.implante, self.sellador, self.ausente_fisio,
-            self.super_num_circ, self.super_num_text,
-        ):
-            itm.setVisible(False)
-        # prótesis
-        self.labels_red.clear()
-        self.labels_blue.clear()
-        self._render_protesis()
-        self.has_bridge = False
+        st = self._writable()
+        had = (st.bridge, st.labels_red[:], st.labels_blue[:])
+        st.clear()
+        self.sync()
+        self._sync_row_items(had)
+
+    def _sync_row_items(self, had: Tuple[bool, List[str], List[str]]) -> None:
+        """Actualiza puente / prótesis de la fila si cambiaron respecto de `had`."""
+        st, view = self.state, self.odontogram_view
+        if st.bridge != had[0]:
+            view.update_bridges((self.row,))
+        if st.labels_red != had[1] or st.labels_blue != had[2]:
+            view.update_prosthesis((self.row,))
+
+
+# ─────────────────────────────────────────────────────────────
+# Prótesis por tramo
+# ─────────────────────────────────────────────────────────────
+class ProsthesisArchItem(QGraphicsItem):
+    """
+    Una prótesis (código = rótulo + color) sobre un tramo contiguo de
+    piezas de una fila: llave con extremos hacia las piezas y el rótulo
+    (p. ej. "PRS") intercalado en la línea.  Reemplaza a los rótulos por
+    pieza: un item por tramo en lugar de uno por pieza.
+    """
+
+    CAP = 4                                    # alto de los extremos de la llave
+    GAP = 3                                    # aire entre la línea y el rótulo
+
+    def __init__(self, row: int, first: int, last: int, text: str,
+                 blue: bool, y: float) -> None:
+        super().__init__()
+        self.key = (blue, text, first, last, y)    # para el diff de update_prosthesis
+        x0, x1 = self.span_x(row, first, last)
+        m = text_metrics(text, PROT_FONT)
+        cx = (x0 + x1) / 2
+        tx0, tx1 = cx - m.width / 2, cx + m.width / 2
+
+        # línea partida por el rótulo; sólo los extremos si el texto no entra
+        self._path = QPainterPath()
+        self._path.moveTo(x0, y + self.CAP)
+        self._path.lineTo(x0, y)
+        if tx0 - self.GAP > x0:
+            self._path.lineTo(tx0 - self.GAP, y)
+        self._path.moveTo(x1, y + self.CAP)
+        self._path.lineTo(x1, y)
+        if tx1 + self.GAP < x1:
+            self._path.lineTo(tx1 + self.GAP, y)
+
+        self._text = static_text(text, PROT_FONT)
+        self._text_pos = QPointF(tx0, y - m.height / 2)
+        self._pen = PROT_BLUE_PEN if blue else PROT_RED_PEN
+        self._text_pen = TEXT_BLUE_PEN if blue else TEXT_RED_PEN
+        w = self._pen.widthF()
+        self._bounds = (self._path.boundingRect().adjusted(-w, -w, w, w)
+                        .united(QRectF(self._text_pos, QSizeF(m.width, m.height))))
+        self.setZValue(1)
+        self.setAcceptedMouseButtons(Qt.NoButton)  # type: ignore[attr-defined]
+
+    @staticmethod
+    def span_x(row: int, first: int, last: int) -> Tuple[float, float]:
+        return LAYOUT[row][first].x, LAYOUT[row][last].x + TOOTH_SIZE
+
+    @classmethod
+    def extent(cls, row: int, first: int, last: int, text: str) -> Tuple[float, float]:
+        """(x mín, x máx) que ocupan llave y rótulo."""
+        x0, x1 = cls.span_x(row, first, last)
+        half = text_metrics(text, PROT_FONT).width / 2
+        cx = (x0 + x1) / 2
+        return min(x0, cx - half), max(x1, cx + half)
+
+    def boundingRect(self) -> QRectF:  # type: ignore[override]
+        return self._bounds
+
+    def paint(self, painter: QPainter, option, widget=None) -> None:  # type: ignore[override]
+        painter.setBrush(Qt.NoBrush)  # type: ignore[attr-defined]
+        painter.setPen(self._pen)
+        painter.drawPath(self._path)
+        painter.setFont(PROT_FONT)
+        painter.setPen(self._text_pen)
+        painter.drawStaticText(self._text_pos, self._text)
 
 
 # ─────────────────────────────────────────────────────────────
 # Vista completa del odontograma
 # ─────────────────────────────────────────────────────────────
 class OdontogramView(QGraphicsView):
-    def __init__(self, locked: bool = False) -> None:
+    def __init__(self, locked: bool = False, render_profile: str | None = None) -> None:
         super().__init__()
         self._scene = QGraphicsScene(self)
         self.setScene(self._scene)
         self.locked = locked
-        self.current_state: str = "Ninguno"
-        self.bridge_lines: List[QGraphicsLineItem] = []
+        self.current_state: str = "Ninguno"           # nombre visible (UI)
+        self.current_code: Estado | None = Estado.NINGUNO
+        # tramos de puente por fila: (col_ini, col_fin) → línea
+        self._bridge_spans: List[Dict[Tuple[int, int], QGraphicsLineItem]] = [
+            {} for _ in LAYOUT
+        ]
+        # prótesis por fila: (azul, rótulo, col_ini, col_fin, y) → item
+        self._prosthesis: List[Dict[tuple, ProsthesisArchItem]] = [{} for _ in LAYOUT]
         self.dientes: List[List[ToothItem]] = []
+        self._by_num: Dict[str, ToothItem] = {}
+        self.states: List[Tuple[int, int, str]] = []   # estados visibles (ver to_dientes)
+        self.last_apply_mutations = 0                  # métrica de apply_batch_states
+        self.model = OdontogramState()                 # estado clínico (sin Qt)
+        self._model_shared = False                     # congelado (BocaCache): copy-on-write
+        # back-buffer: (clave, modelo, estados) preparado fuera de pantalla
+        self._back: Tuple[Hashable, OdontogramState, List[Tuple[int, int, str]]] | None = None
+        # lote de actualizaciones (ver batch_update)
+        self.batching = True                           # False → una invalidación por pieza
+        self._batch_depth = 0
+        self._batch_dirty: List[ToothItem] = []
+        # instrumentación de QGraphicsScene.changed (ver count_scene_changes)
+        self.scene_changes = {"signals": 0, "rects": 0}
+        self.render_profile = ""
+        self._skeleton = SkeletonItem(skeleton_picture(TOOTH_SIZE))
+        self._scene.addItem(self._skeleton)
         self._create_teeth()
+        self.apply_render_profile(render_profile)
 
     # ------------------------ creación ---------------------
     def _create_teeth(self) -> None:
-        size, margin = TOOTH_SIZE, TOOTH_MARGIN
-        base_width = max(len(r) for r in TEETH_ROWS) * (size + margin) - margin
-    
-        for idx, row in enumerate(TEETH_ROWS):
-            row_w = len(row) * (size + margin) - margin
-            offset_x = (base_width - row_w) // 2
-            y = Y_POSITIONS[idx] + TOP_PADDING + idx * BETWEEN_ROWS_EXTRA
-
+        size = TOOTH_SIZE
+        for row in LAYOUT:
             t_row: List[ToothItem] = []
-            for i, num in enumerate(row):
-                x = 50 + offset_x + i * (size + margin)
-                t = ToothItem(x, y, size, self._scene, self, num)
+            for info in row:
+                num = str(info.num)
+                t = ToothItem(info.x, info.y, size, self._scene, self, num)
                 t_row.append(t)
-
-                txt = cast(QGraphicsTextItem,
-                           self._scene.addText(num, QFont("Arial", 10)))
-                txt.setDefaultTextColor(BLACK)
-                txt.setPos(
-                    x + size / 2 - txt.boundingRect().width() / 2,
-                    y + size + 3
-                )
+                self._by_num[num] = t
             self.dientes.append(t_row)
 
+    def apply_render_profile(self, name: str | None = None) -> str:
+        """Aplica un perfil de Styles.render_profile; devuelve su nombre."""
+        self.render_profile = profile_name(name)
+        prof = PROFILES[self.render_profile]
+        self._scene.setItemIndexMethod(prof.index)
+        self.setViewportUpdateMode(prof.update_mode)
+        self.setOptimizationFlags(QGraphicsView.OptimizationFlags(prof.optimization))
+        for t in self._by_num.values():
+            t.setCacheMode(prof.item_cache)
+        for items in self._prosthesis:
+            for item in items.values():
+                item.setCacheMode(prof.item_cache)
+        return self.render_profile
+
     # ---------------- cambio de estado actual --------------
     def set_current_state(self, name: str) -> None:
         self.current_state = name
+        self.current_code = ESTADOS.get(name)
+
+    # ------------- estado actual ↔ string dientes ----------
+    def record_edit(self, tooth: ToothItem, code: int | None) -> None:
+        """Refleja en `states` un clic de edición con el estado `code` sobre `tooth`."""
+        pieza = int(tooth.num)
+        if code is None:
+            return
+        if code == Estado.NINGUNO:
+            self.states = [s for s in self.states if s[1] != pieza]
+            return
+        cod = int(code)                        # tuplas de `states`: int plano
+        if cod == Estado.OBTURACION:
+            # caras ya registradas (p. ej. cargadas de la BD) que siguen
+            # pintadas + las elegidas a mano: el clic no pisa las anteriores
+            st = tooth.state
+            prev = 0
+            for s in self.states:
+                if s[0] == cod and s[1] == pieza:
+                    prev |= faces_mask(s[2])
+            sel = "".join(
+                _FACE_LETTER[n] for i, n in enumerate(FACE_NAMES)
+                if st.selected >> i & 1 or (prev >> i & 1 and st.faces[i] != FILL_WHITE)
+            )
+            self.states = [s for s in self.states if not (s[0] == cod and s[1] == pieza)]
+            if sel:
+                self.states.append((cod, pieza, sel))
+        elif cod == Estado.PUENTE and not tooth.has_bridge:
+            self.states = [s for s in self.states if not (s[0] == cod and s[1] == pieza)]
+        else:
+            self.states.append((cod, pieza, ""))
+
+    def current_states(self) -> List[Tuple[int, int, str]]:
+        """Estados del odontograma en forma canónica."""
+        return canonical_states(self.states)
+
+    def to_dientes(self) -> str:
+        """Serializa el odontograma visible a un string `dientes` canónico."""
+        return encode_dientes(self.states)
 
     # ------------------------- puente ----------------------
-    def update_bridges(self) -> None:
-        for ln in self.bridge_lines:
-            self._scene.removeItem(ln)
-        self.bridge_lines.clear()
-
-        for row in self.dientes:
-            for t in row:
-                if t.has_bridge:
-                    rect = t.faces["top"].mapToScene(
-                        t.faces["top"].boundingRect()).boundingRect()
-                    y_line = rect.center().y() + t.size / 2 - 10
-                    x_left, x_right = rect.left() - 5, rect.right() + 5
-                    ln = cast(QGraphicsLineItem,
-                              self._scene.addLine(x_left, y_line,
-                                                  x_right, y_line, RED_BRIDGE_PEN))
-                    ln.setZValue(0)
-                    self.bridge_lines.append(ln)
+    @property
+    def bridge_lines(self) -> List[QGraphicsLineItem]:
+        """Líneas de puente en escena (un item por tramo contiguo)."""
+        return [ln for spans in self._bridge_spans for ln in spans.values()]
+
+    def _bridge_runs(self, row: int) -> List[Tuple[int, int]]:
+        """Tramos (col_ini, col_fin) de piezas contiguas con puente en `row`."""
+        teeth = self.model.teeth
+        runs: List[Tuple[int, int]] = []
+        start = -1
+        for col, info in enumerate(LAYOUT[row]):
+            if teeth[info.num].bridge:
+                if start < 0:
+                    start = col
+            elif start >= 0:
+                runs.append((start, col - 1))
+                start = -1
+        if start >= 0:
+            runs.append((start, len(LAYOUT[row]) - 1))
+        return runs
+
+    def _add_bridge_span(self, row: int, first: int, last: int) -> QGraphicsLineItem:
+        n0, n1 = LAYOUT[row][first].num, LAYOUT[row][last].num
+        ln = cast(QGraphicsLineItem,
+                  self._scene.addLine(tg.BRIDGE_X0[n0], tg.BRIDGE_Y[n0],
+                                      tg.BRIDGE_X1[n1], tg.BRIDGE_Y[n1], RED_BRIDGE_PEN))
+        ln.setZValue(1)
+        ln.setAcceptedMouseButtons(Qt.NoButton)  # type: ignore[attr-defined]
+        return ln
+
+    def update_bridges(self, rows: Iterable[int] | None = None) -> int:
+        """
+        Sincroniza las líneas de puente de `rows` (por defecto, todas).
+        Cada tramo contiguo es un único item que persiste mientras el tramo
+        no cambie; sólo se quitan/agregan los tramos que aparecen o
+        desaparecen.  Devuelve el nº de items tocados.
+        """
+        touched = 0
+        for row in (range(len(LAYOUT)) if rows is None else rows):
+            spans = self._bridge_spans[row]
+            want = self._bridge_runs(row)
+            for key in [k for k in spans if k not in want]:
+                self._scene.removeItem(spans.pop(key))
+                touched += 1
+            for key in want:
+                if key not in spans:
+                    spans[key] = self._add_bridge_span(row, *key)
+                    touched += 1
+        return touched
+
+    # ------------------------ prótesis ---------------------
+    @property
+    def prosthesis_items(self) -> List[ProsthesisArchItem]:
+        """Items de prótesis en escena (uno por código y tramo contiguo)."""
+        return [it for items in self._prosthesis for it in items.values()]
+
+    def _prosthesis_runs(self, row: int) -> List[Tuple[bool, str, int, int]]:
+        """
+        Tramos (azul, rótulo, col_ini, col_fin) de piezas contiguas de `row`
+        con la misma prótesis; rojos antes que azules, luego por rótulo
+        (orden de aparición) y columna.
+        """
+        teeth = self.model.teeth
+        row_teeth = [teeth[info.num] for info in LAYOUT[row]]
+        runs: List[Tuple[bool, str, int, int]] = []
+        for blue in (False, True):
+            labels: List[str] = []
+            for st in row_teeth:
+                lst = st.labels_blue if blue else st.labels_red
+                labels.extend(lb for lb in lst if lb not in labels)
+            for label in labels:
+                start = -1
+                for col, st in enumerate(row_teeth):
+                    if label in (st.labels_blue if blue else st.labels_red):
+                        if start < 0:
+                            start = col
+                    elif start >= 0:
+                        runs.append((blue, label, start, col - 1))
+                        start = -1
+                if start >= 0:
+                    runs.append((blue, label, start, len(row_teeth) - 1))
+        return runs
+
+    @staticmethod
+    def _prosthesis_band(row: int) -> Tuple[float, float]:
+        """
+        (y inferior, alto disponible) de la franja de prótesis de `row`:
+        entre el borde superior de sus piezas y los números de la fila de
+        arriba (sin tope si es la primera).
+        """
+        bottom = tg.ROW_Y[row] - 2
+        above = [y for y in tg.ROW_Y if y < tg.ROW_Y[row]]
+        if not above:
+            return bottom, float("inf")
+        num_bottom = (max(above) + tg.NUM_ANCHOR[1] + TEXT_MARGIN
+                      + text_metrics("0", NUM_FONT).height)
+        return bottom, bottom - num_bottom
+
+    def _prosthesis_layout(self, row: int) -> List[Tuple[bool, str, int, int, float]]:
+        """
+        Asigna carriles a los tramos de `row`: cada uno va al carril más
+        cercano a las piezas donde no se superpone en x con otro.  Si los
+        carriles no entran en la franja se comprimen (nunca invaden los
+        números de la fila de arriba).  Devuelve (… , y de la línea).
+        """
+        runs = self._prosthesis_runs(row)
+        if not runs:
+            return []
+        lanes: List[List[Tuple[float, float]]] = []
+        lane_of: List[int] = []
+        for blue, label, c0, c1 in runs:
+            x0, x1 = ProsthesisArchItem.extent(row, c0, c1, label)
+            for k, used in enumerate(lanes):
+                if all(x1 + 4 <= u0 or u1 + 4 <= x0 for u0, u1 in used):
+                    used.append((x0, x1))
+                    break
+            else:
+                k = len(lanes)
+                lanes.append([(x0, x1)])
+            lane_of.append(k)
+        bottom, avail = self._prosthesis_band(row)
+        lane_h = min(text_metrics("P", PROT_FONT).height + 2, avail / len(lanes))
+        return [(*run, bottom - lane_h * (k + 0.5))
+                for run, k in zip(runs, lane_of)]
+
+    def update_prosthesis(self, rows: Iterable[int] | None = None) -> int:
+        """
+        Sincroniza los items de prótesis de `rows` (por defecto, todas): uno
+        por código y tramo contiguo de piezas.  Sólo se quitan / agregan los
+        items cuyo tramo, rótulo o carril cambió.  Devuelve el nº de items
+        tocados.
+        """
+        touched = 0
+        item_cache = PROFILES[self.render_profile].item_cache if self.render_profile else None
+        for row in (range(len(LAYOUT)) if rows is None else rows):
+            items = self._prosthesis[row]
+            want = self._prosthesis_layout(row)
+            keys = set(want)
+            for key in [k for k in items if k not in keys]:
+                self._scene.removeItem(items.pop(key))
+                touched += 1
+            for key in want:
+                if key not in items:
+                    blue, label, c0, c1, y = key
+                    item = items[key] = ProsthesisArchItem(row, c0, c1, label, blue, y)
+                    if item_cache is not None:
+                        item.setCacheMode(item_cache)
+                    self._scene.addItem(item)
+                    touched += 1
+        return touched
 
     # --------------- aplicar batch de estados --------------
-    def apply_batch_states(self, states: List[Tuple[int, int, str]]) -> None:
+    def apply_batch_states(self, states: List[Tuple[int, int, str]]) -> int:
         """
         · states = [(codEstado, numPieza, caras), ...]
+
+        Construye el modelo nuevo (sin Qt) y sincroniza sólo las piezas y
+        QGraphicsItems que cambian respecto de lo que ya está en pantalla.
+        Devuelve (y guarda en `last_apply_mutations`) la cantidad de
+        mutaciones realizadas.
+        """
+        self.states = list(states)
+        return self.set_model(OdontogramState.from_states(states))
+
+    # ------------------- doble buffer ----------------------
+    def prepare_back(self, key: Hashable, states: Iterable[Tuple[int, int, str]]) -> None:
+        """
+        Resuelve `states` en el back-buffer sin tocar la escena (pensado
+        para tiempo ocioso: prefetch de la próxima boca).  `swap_back(key)`
+        lo muestra después.
+        """
+        lst = list(states)
+        self._back = (key, OdontogramState.from_states(lst), lst)
+
+    def has_back(self, key: Hashable) -> bool:
+        return self._back is not None and self._back[0] == key
+
+    def swap_back(self, key: Hashable) -> bool:
+        """
+        Muestra el back-buffer si fue preparado para `key`: cambio de modelo
+        + sincronización de las piezas que difieren (un solo repintado).
+        Devuelve False si no hay back-buffer para esa clave.
+        """
+        if not self.has_back(key):
+            return False
+        _key, model, states = cast(tuple, self._back)
+        self._back = None
+        self.states = states
+        self.set_model(model)
+        return True
+
+    def restore(self, model: OdontogramState,
+                states: Iterable[Tuple[int, int, str]]) -> int:
+        """
+        Muestra un modelo ya resuelto (p. ej. desde `BocaCache`) sin volver
+        a aplicar estados.  No se copia: la vista toma la referencia y, si
+        después se edita, copia el dict y sólo las piezas que cambian.
+        """
+        self.states = list(states)
+        mutations = self.set_model(model)
+        self._model_shared = True
+        return mutations
+
+    def freeze_model(self) -> OdontogramState:
+        """
+        Modelo actual para guardarlo (p. ej. en `BocaCache`) sin copiarlo;
+        desde aquí la vista lo trata como compartido (copy-on-write).
+        """
+        self._model_shared = True
+        return self.model
+
+    def _own_model(self) -> OdontogramState:
+        """Modelo propio antes de editar: copia superficial si está compartido."""
+        if self._model_shared:
+            self.model = self.model.shallow_copy()
+            self._model_shared = False
+        return self.model
+
+    def set_model(self, model: OdontogramState) -> int:
+        """Reemplaza el modelo y sincroniza la escena (diff por pieza)."""
+        self.model = model
+        self._model_shared = False
+        mutations = 0
+        rows = set()                       # filas con algún puente que cambió
+        prot_rows = set()                  # filas con rótulos de prótesis que cambiaron
+        with self.batch_update():
+            for t in self._by_num.values():
+                old = t._shown
+                if t.sync():
+                    mutations += 1
+                    new = t._shown
+                    if new.bridge != old.bridge:
+                        rows.add(t.row)
+                    if (new.labels_red != old.labels_red
+                            or new.labels_blue != old.labels_blue):
+                        prot_rows.add(t.row)
+
+            if rows:
+                mutations += self.update_bridges(rows)
+            if prot_rows:
+                mutations += self.update_prosthesis(prot_rows)
+        self.last_apply_mutations = mutations
+        return mutations
+
+    # ------------------ lote de cambios --------------------
+    @contextmanager
+    def batch_update(self) -> Iterator[None]:
+        """
+        Agrupa mutaciones de escena: las piezas que cambian no se invalidan
+        una por una sino al salir, con una región por fila (≤ 4 rects en
+        vez de uno por pieza).  Se puede anidar.
+
+        No se toca `setUpdatesEnabled` (al re-habilitarlo Qt repinta todo el
+        viewport) ni el índice BSP (Qt ya difiere su actualización hasta
+        el event loop).
+        """
+        if not self.batching:
+            yield
+            return
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._flush_batch()
+
+    def _flush_batch(self) -> None:
+        dirty, self._batch_dirty = self._batch_dirty, []
+        if not dirty:
+            return
+        mode = dirty[0].cacheMode()
+        if mode != QGraphicsItem.NoCache:
+            # re-asignar el mismo modo descarta el pixmap cacheado: sin esto
+            # los perfiles con DeviceCoordinateCache pintan el estado viejo.
+            # setCacheMode también llama a update() del item; Qt lo funde con
+            # los rectángulos por fila de abajo (mismo nº de rects en
+            # QGraphicsScene.changed con y sin este bucle), no ahorra repintado.
+            for t in dirty:
+                t.setCacheMode(mode)
+        rows: Dict[int, QRectF] = {}
+        for t in dirty:
+            r = t.row
+            rows[r] = rows.get(r, QRectF()).united(t.sceneBoundingRect())
+        for rect in rows.values():
+            self._scene.update(rect)
+
+    def count_scene_changes(self, enabled: bool = True) -> Dict[str, int]:
+        """
+        Cuenta las notificaciones `QGraphicsScene.changed` (señales y
+        rectángulos) en `scene_changes`.  Sólo para diagnóstico: conectar
+        esa señal desactiva algunas optimizaciones internas de Qt.
         """
-        per_tooth: Dict[str, List[Tuple[int, str, str]]] = defaultdict(list)
-        for cod, pieza, caras in states:
-            nombre = ESTADOS_POR_NUM.get(cod)
-            if not nombre:
-                print(f"[WARN] Estado {cod} no definido")
-                continue
-            per_tooth[str(pieza)].append((cod, nombre, caras))
-
-        # reset general
-        for fila in self.dientes:
-            for t in fila:
-                t.reset()
-
-        # aplicar
-        for num, lst in per_tooth.items():
-            t = self.find_tooth(num)
-            if not t:
-                print(f"[WARN] Pieza {num} no encontrada")
-                continue
-            for cod, nombre, caras in lst:
-                if nombre in ("Obturacion", "Caries") and caras:
-                    t.apply_obturation_faces(caras, nombre)
-                else:
-                    t.apply_state(nombre, code=cod)
-        self.update_bridges()
+        try:
+            self._scene.changed.disconnect(self._on_scene_changed)
+        except TypeError:
+            pass
+        if enabled:
+            self._scene.changed.connect(self._on_scene_changed)
+        return self.scene_changes
+
+    def _on_scene_changed(self, rects: List[QRectF]) -> None:
+        self.scene_changes["signals"] += 1
+        self.scene_changes["rects"] += len(rects)
+
+    # ------------------- hit-testing -----------------------
+    def hit_test(self, scene_pt: QPointF) -> Tuple[ToothItem | None, str | None]:
+        """
+        (pieza, cara) bajo el punto de escena, o (None, None).  Usa las
+        tablas de Modules.tooth_geometry: tiempo constante, sin recorrer
+        los items de la escena (esqueleto, puentes y prótesis no
+        participan).
+        """
+        num, face = tg.hit(scene_pt.x(), scene_pt.y())
+        if not num or face < 0:
+            return None, None
+        return self._by_num[str(num)], FACE_NAMES[face]
+
+    def mousePressEvent(self, event) -> None:  # type: ignore[override]
+        """
+        En modo edición los clics van directo a `hit_test` → `ToothItem.click`;
+        fuera de una pieza se ignoran (nada más en la escena es interactivo).
+        """
+        if self.locked:
+            super().mousePressEvent(event)
+            return
+        tooth, face = self.hit_test(self.mapToScene(event.pos()))
+        if tooth is None or face is None:
+            event.ignore()
+            return
+        tooth.click(face)
+        event.accept()
 
     # ----------------- utilidades --------------------------
     def find_tooth(self, num: str) -> ToothItem | None:
-        for row in self.dientes:
-            for t in row:
-                if t.num == num:
-                    return t
-        return None
+        return self._by_num.get(num)
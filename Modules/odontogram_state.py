@@ -0,0 +1,305 @@
+# coding: utf-8
+"""
+Modules/odontogram_state.py
+
+Modelo del odontograma **sin Qt**: qué muestra cada pieza (relleno de
+caras, líneas cruzadas, overlays, rótulos de prótesis y puente) y toda
+la lógica de transición de estados que antes vivía en
+`ToothItem.apply_state`.
+
+`ToothItem` (Modules/modelos_sin_imagenes.py) sólo sincroniza la escena
+desde un `ToothState`; cálculos masivos, diffs y pruebas pueden correr
+sin QApplication.
+
+    model = OdontogramState.from_states(parse_dientes_sp(raw))
+    model.teeth[11].faces     → [FILL_RED, …]
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+
+from Modules.utils import (
+    ESTADOS, ESTADOS_POR_NUM, FACE_MAP, MAX_STATE, PROTESIS_AZUL, PROTESIS_SHORT, Estado,
+)
+from Modules.tooth_index import FDI_NUMBERS
+
+# ─────────────────────────────────────────────────────────────
+# Constantes del modelo
+# ─────────────────────────────────────────────────────────────
+FACE_NAMES: Tuple[str, ...] = ("top", "right", "bottom", "left", "center")
+FACE_INDEX: Dict[str, int] = {n: i for i, n in enumerate(FACE_NAMES)}
+
+# Relleno de cara
+FILL_WHITE, FILL_RED, FILL_BLUE, FILL_GRAY = range(4)
+
+# Líneas cruzadas (PD Ausente domina sobre Extracción)
+LINES_NONE, LINES_EXT, LINES_PD = range(3)
+
+# Overlays (bits)
+OV_CORONA    = 1
+OV_IMPLANTE  = 2
+OV_SELLADOR  = 4
+OV_AUSENTE   = 8
+OV_SUPER     = 16
+
+_ALL_FACES_MASK = (1 << len(FACE_NAMES)) - 1
+
+
+# ─────────────────────────────────────────────────────────────
+# Pieza
+# ─────────────────────────────────────────────────────────────
+class ToothState:
+    """Estado visible de una pieza; se compara por valor."""
+
+    __slots__ = ("faces", "selected", "lines", "overlays",
+                 "labels_red", "labels_blue", "bridge")
+
+    def __init__(self) -> None:
+        self.faces: List[int] = [FILL_WHITE] * len(FACE_NAMES)
+        self.selected = 0                     # bits de caras elegidas a mano
+        self.lines = LINES_NONE
+        self.overlays = 0
+        self.labels_red: List[str] = []
+        self.labels_blue: List[str] = []
+        self.bridge = False
+
+    def copy(self) -> "ToothState":
+        t = ToothState.__new__(ToothState)
+        t.faces = self.faces[:]
+        t.selected = self.selected
+        t.lines = self.lines
+        t.overlays = self.overlays
+        t.labels_red = self.labels_red[:]
+        t.labels_blue = self.labels_blue[:]
+        t.bridge = self.bridge
+        return t
+
+    def _key(self) -> tuple:
+        return (self.faces, self.selected, self.lines, self.overlays,
+                self.labels_red, self.labels_blue, self.bridge)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ToothState) and self._key() == other._key()
+
+    __hash__ = None  # type: ignore[assignment]   (mutable)
+
+    @property
+    def is_blank(self) -> bool:
+        return self == _BLANK
+
+    # -------------------------- transiciones --------------------------
+    def _fill(self, fill: int, mask: int = _ALL_FACES_MASK) -> None:
+        for i in range(len(FACE_NAMES)):
+            if mask >> i & 1:
+                self.faces[i] = fill
+        self.selected &= ~mask
+
+    def clear(self) -> None:
+        blank = ToothState()
+        for slot in ToothState.__slots__:
+            setattr(self, slot, getattr(blank, slot))
+
+    def apply(self, name: str, code: int | None = None, faces: str = "") -> bool:
+        """
+        Aplica el estado `name` (o `code`, si se da: tiene prioridad).
+        · Obturación / caries con `faces` → sólo esas caras.
+        · Prótesis → lista roja o azul (según el código).
+        Devuelve False (y lo registra en el log) si el estado no existe.
+        """
+        handler = _BY_CODE.get(code) if code is not None else _BY_NAME.get(name)
+        if handler is None:
+            logging.warning("Estado no manejado: %s", name if code is None else code)
+            return False
+        handler(self, faces)
+        return True
+
+    def apply_code(self, code: int, faces: str = "") -> bool:
+        """Aplica el estado de código `code`; False si el código no existe."""
+        handler = _DISPATCH[code] if 0 <= code <= MAX_STATE else None
+        if handler is None:
+            return False
+        handler(self, faces)
+        return True
+
+    def toggle_face(self, face_name: str) -> bool:
+        """
+        Clic de edición con “Obturacion”: alterna la cara roja/blanca.
+        Se pinta con el mismo color con que se recarga la obturación
+        guardada; `selected` recuerda qué caras eligió la mano.
+        """
+        bit = 1 << FACE_INDEX[face_name]
+        on = not self.selected & bit
+        self._fill(FILL_RED if on else FILL_WHITE, bit)
+        if on:
+            self.selected |= bit
+        return on
+
+    def selected_faces(self) -> List[str]:
+        return [n for i, n in enumerate(FACE_NAMES) if self.selected >> i & 1]
+
+
+_BLANK = ToothState()
+
+
+# ─────────────────────────────────────────────────────────────
+# Tabla de despacho (se arma una vez al importar)
+# ─────────────────────────────────────────────────────────────
+# handler(pieza, caras) – sin asignaciones por llamada: las máscaras de
+# caras se cachean por string y los rótulos se resuelven al armar la tabla.
+Handler = Callable[[ToothState, str], None]
+
+_FACE_MASKS: Dict[str, int] = {"": _ALL_FACES_MASK}
+
+
+def _faces_mask(faces: str) -> int:
+    mask = _FACE_MASKS.get(faces)
+    if mask is None:
+        mask = 0
+        for c in faces.upper():
+            face_name = FACE_MAP.get(c)
+            if face_name:
+                mask |= 1 << FACE_INDEX[face_name]
+        _FACE_MASKS[faces] = mask
+    return mask
+
+
+def _h_fill(fill: int) -> Handler:
+    def handler(ts: ToothState, faces: str) -> None:
+        ts._fill(fill, _faces_mask(faces))
+    return handler
+
+
+def _h_fill_all(fill: int) -> Handler:
+    def handler(ts: ToothState, _faces: str) -> None:
+        ts._fill(fill)
+    return handler
+
+
+def _h_label(label: str, blue: bool) -> Handler:
+    def handler(ts: ToothState, _faces: str) -> None:
+        lst = ts.labels_blue if blue else ts.labels_red
+        if label not in lst:
+            lst.append(label)
+    return handler
+
+
+def _h_overlay(bit: int) -> Handler:
+    def handler(ts: ToothState, _faces: str) -> None:
+        ts.overlays |= bit
+    return handler
+
+
+def _h_clear(ts: ToothState, _faces: str) -> None:
+    ts.clear()
+
+
+def _h_pd(ts: ToothState, _faces: str) -> None:
+    ts.lines = LINES_PD
+
+
+def _h_extraction(ts: ToothState, _faces: str) -> None:
+    if ts.lines < LINES_EXT:
+        ts.lines = LINES_EXT
+
+
+def _h_bridge(ts: ToothState, _faces: str) -> None:
+    ts.bridge = True
+
+
+_BY_CODE: Dict[int, Handler] = {
+    Estado.NINGUNO:             _h_clear,
+    Estado.OBTURACION:          _h_fill(FILL_RED),
+    Estado.CARIES:              _h_fill(FILL_BLUE),
+    Estado.AGENESIA:            _h_fill_all(FILL_GRAY),
+    Estado.PD_AUSENTE:          _h_pd,
+    Estado.EXTRACCION:          _h_extraction,
+    Estado.CORONA:              _h_overlay(OV_CORONA),
+    Estado.IMPLANTE:            _h_overlay(OV_IMPLANTE),
+    Estado.SELLADORES:          _h_overlay(OV_SELLADOR),
+    Estado.AUSENTE_FISIOLOGICO: _h_overlay(OV_AUSENTE),
+    Estado.PUENTE:              _h_bridge,
+    # prótesis: rótulo corto, lista roja o azul según el código
+    **{code: _h_label(PROTESIS_SHORT[ESTADOS_POR_NUM[code]], code in PROTESIS_AZUL)
+       for code in ESTADOS_POR_NUM if ESTADOS_POR_NUM[code] in PROTESIS_SHORT},
+}
+
+# Por nombre visible (clics de la UI); “Supernumerario” no tiene código
+_BY_NAME: Dict[str, Handler] = {name: _BY_CODE[code] for name, code in ESTADOS.items()}
+_BY_NAME["Supernumerario"] = _h_overlay(OV_SUPER)
+
+# lista indexada por código (0..MAX_STATE) para el camino masivo
+_DISPATCH: List[Handler | None] = [_BY_CODE.get(c) for c in range(MAX_STATE + 1)]
+
+
+# ─────────────────────────────────────────────────────────────
+# Odontograma completo
+# ─────────────────────────────────────────────────────────────
+class OdontogramState:
+    """Un `ToothState` por cada pieza FDI del layout."""
+
+    __slots__ = ("teeth",)
+
+    def __init__(self) -> None:
+        self.teeth: Dict[int, ToothState] = {n: ToothState() for n in FDI_NUMBERS}
+
+    @classmethod
+    def from_states(cls, states: Iterable[Tuple[int, int, str]]) -> "OdontogramState":
+        """Construye el modelo a partir de [(codEstado, numPieza, caras), …]."""
+        model = cls()
+        model.apply_batch(states)
+        return model
+
+    def apply_batch(self, states: Iterable[Tuple[int, int, str]]) -> List[Tuple[int, int, str]]:
+        """
+        Aplica una lista de estados, en orden, sobre el modelo actual.
+        Despacho por código vía `_DISPATCH` (sin buscar nombres por estado).
+
+        Devuelve los estados omitidos (código o pieza inexistente); si hay,
+        se registra un solo warning resumido en el log.
+        """
+        teeth, dispatch = self.teeth, _DISPATCH
+        skipped: List[Tuple[int, int, str]] = []
+        for st in states:
+            cod, pieza, caras = st
+            handler = dispatch[cod] if 0 <= cod <= MAX_STATE else None
+            ts = teeth.get(pieza)
+            if handler is None or ts is None:
+                skipped.append(st)
+                continue
+            handler(ts, caras)
+        if skipped:
+            codes: Set[int] = {c for c, _p, _f in skipped
+                               if not (0 <= c <= MAX_STATE and dispatch[c])}
+            teeth_bad: Set[int] = {p for _c, p, _f in skipped if p not in teeth}
+            logging.warning("%d estados omitidos: códigos no definidos %s, piezas inexistentes %s",
+                            len(skipped), sorted(codes), sorted(teeth_bad))
+        return skipped
+
+    def copy(self) -> "OdontogramState":
+        m = OdontogramState.__new__(OdontogramState)
+        m.teeth = {n: t.copy() for n, t in self.teeth.items()}
+        return m
+
+    def shallow_copy(self) -> "OdontogramState":
+        """
+        Copia que comparte los `ToothState` (copy-on-write): quien vaya a
+        mutar una pieza debe reemplazarla antes por su `copy()`.
+        """
+        m = OdontogramState.__new__(OdontogramState)
+        m.teeth = dict(self.teeth)
+        return m
+
+    def diff(self, other: "OdontogramState") -> List[int]:
+        """Piezas cuyo estado difiere entre `self` y `other`."""
+        return [n for n, t in self.teeth.items() if t != other.teeth[n]]
+
+    def bridged(self) -> List[int]:
+        """Piezas con puente, en orden de layout."""
+        return [n for n, t in self.teeth.items() if t.bridge]
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, OdontogramState) and not self.diff(other)
+
+    __hash__ = None  # type: ignore[assignment]
@@ -0,0 +1,161 @@
+# coding: utf-8
+"""
+Modules/tooth_geometry.py
+
+Geometría del odontograma **compilada una vez** (sin Qt) a partir de
+`TEETH_ROWS`, `TOOTH_SIZE`, `TOOTH_MARGIN`, `TOP_PADDING` y
+`BETWEEN_ROWS_EXTRA` (vía Modules.tooth_index).
+
+Comparten estas tablas la escena (ToothItem / OdontogramView), el
+hit-testing y cualquier exportador sin QApplication.
+
+Coordenadas locales de una pieza (origen = esquina sup. izq.):
+• `FACE_POLYS[i]`  – polígono de la cara `FACE_NAMES[i]`.
+• `OUTLINE_DIAGONALS` – los 4 segmentos esquina → cuadrado central.
+• `circle_rect(s, OVERLAY_RATIOS[nombre])` – rect de corona, sellador, …
+• `NUM_ANCHOR` – centro-x / borde sup. del número de pieza.
+
+Coordenadas de escena por número FDI (arrays planos 0-99, -1 = no existe):
+• `RECT_X`, `RECT_Y` – esquina sup. izq. de la pieza.
+• `BRIDGE_X0`, `BRIDGE_X1`, `BRIDGE_Y` – extremos del tramo de puente.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Tuple
+
+from Modules.utils import TOOTH_SIZE, TOOTH_MARGIN
+from Modules.tooth_index import LAYOUT, TOOTH_INFO
+from Modules.odontogram_state import FACE_NAMES
+
+Point = Tuple[float, float]
+Rect = Tuple[float, float, float, float]
+
+STEP = TOOTH_SIZE + TOOTH_MARGIN          # paso horizontal entre piezas
+OUTLINE_W = 2                             # grosor del contorno de las caras
+# la línea sobresale 5 px del contorno de la pieza (incluido su grosor)
+BRIDGE_OVERHANG = 5 + OUTLINE_W / 2
+
+
+# ─────────────────────────────────────────────────────────────
+# Geometría local (paramétrica en el lado `s`)
+# ─────────────────────────────────────────────────────────────
+def face_polys(s: float) -> Tuple[Tuple[Point, ...], ...]:
+    """Polígonos de las 5 caras, en el orden de FACE_NAMES."""
+    fs = s / 3
+    pts = {
+        "top":    ((0, 0), (s, 0), (s - fs, fs), (fs, fs)),
+        "right":  ((s, 0), (s, s), (s - fs, s - fs), (s - fs, fs)),
+        "bottom": ((s, s), (0, s), (fs, s - fs), (s - fs, s - fs)),
+        "left":   ((0, s), (0, 0), (fs, fs), (fs, s - fs)),
+        "center": ((fs, fs), (s - fs, fs), (s - fs, s - fs), (fs, s - fs)),
+    }
+    return tuple(pts[name] for name in FACE_NAMES)
+
+
+def outline_diagonals(s: float) -> Tuple[Tuple[Point, Point], ...]:
+    fs = s / 3
+    return (((0, 0), (fs, fs)), ((s, 0), (s - fs, fs)),
+            ((s, s), (s - fs, s - fs)), ((0, s), (fs, s - fs)))
+
+
+def circle_rect(s: float, ratio: float) -> Rect:
+    """Rect del círculo centrado de diámetro `s * ratio`."""
+    d, c = s * ratio, s / 2
+    return (c - d / 2, c - d / 2, d, d)
+
+
+# Diámetro relativo de cada overlay circular
+OVERLAY_RATIOS: Dict[str, float] = {
+    "corona":   1.1,
+    "ausente":  1.0,
+    "super":    0.4,
+    "sellador": 0.2,
+}
+
+
+def num_anchor(s: float) -> Point:
+    """(centro-x, borde sup.) del número de pieza."""
+    return (s / 2, s + 3)
+
+
+def bridge_dy(s: float) -> float:
+    """y local de la línea de puente."""
+    return s / 6 + s / 2 - 10
+
+
+_TOP, _RIGHT, _BOTTOM, _LEFT, _CENTER = (FACE_NAMES.index(n) for n in
+                                         ("top", "right", "bottom", "left", "center"))
+
+
+def face_at(x: float, y: float, s: float = TOOTH_SIZE) -> int:
+    """Índice (en FACE_NAMES) de la cara bajo el punto local, o -1 si cae fuera."""
+    fs = s / 3
+    if not (0 <= x <= s and 0 <= y <= s):
+        return -1
+    if fs <= x <= s - fs and fs <= y <= s - fs:
+        return _CENTER
+    dx, dy = x - s / 2, y - s / 2
+    if abs(dx) <= abs(dy):
+        return _TOP if dy < 0 else _BOTTOM
+    return _LEFT if dx < 0 else _RIGHT
+
+
+# Tablas para TOOTH_SIZE ------------------------------------------------
+FACE_POLYS = face_polys(TOOTH_SIZE)
+OUTLINE_DIAGONALS = outline_diagonals(TOOTH_SIZE)
+NUM_ANCHOR = num_anchor(TOOTH_SIZE)
+BRIDGE_DY = bridge_dy(TOOTH_SIZE)
+
+
+# ─────────────────────────────────────────────────────────────
+# Tablas de escena por número FDI
+# ─────────────────────────────────────────────────────────────
+def _flat(typecode: str, fn) -> array:
+    arr = array(typecode, [-1] * 100)
+    for t in TOOTH_INFO.values():
+        arr[t.num] = fn(t)
+    return arr
+
+
+RECT_X:    array = _flat("h", lambda t: t.x)
+RECT_Y:    array = _flat("h", lambda t: t.y)
+BRIDGE_X0: array = _flat("d", lambda t: t.x - BRIDGE_OVERHANG)
+BRIDGE_X1: array = _flat("d", lambda t: t.x + TOOTH_SIZE + BRIDGE_OVERHANG)
+BRIDGE_Y:  array = _flat("d", lambda t: t.y + BRIDGE_DY)
+
+# Origen y largo de cada fila (para hit-testing sin recorrer piezas)
+ROW_X0:  Tuple[int, ...] = tuple(row[0].x for row in LAYOUT)
+ROW_Y:   Tuple[int, ...] = tuple(row[0].y for row in LAYOUT)
+ROW_LEN: Tuple[int, ...] = tuple(len(row) for row in LAYOUT)
+
+
+def tooth_rect(num: int) -> Rect:
+    """Rect de escena (x, y, w, h) de la pieza `num`."""
+    return (RECT_X[num], RECT_Y[num], TOOTH_SIZE, TOOTH_SIZE)
+
+
+def face_polygon(num: int, face: int) -> Tuple[Point, ...]:
+    """Polígono de escena de la cara `face` (índice en FACE_NAMES) de `num`."""
+    ox, oy = RECT_X[num], RECT_Y[num]
+    return tuple((ox + x, oy + y) for x, y in FACE_POLYS[face])
+
+
+def tooth_at(x: float, y: float) -> int:
+    """Número FDI de la pieza bajo el punto de escena (x, y), o 0 si no hay."""
+    for r, y0 in enumerate(ROW_Y):
+        if y0 <= y <= y0 + TOOTH_SIZE:
+            col, dx = divmod(x - ROW_X0[r], STEP)
+            if 0 <= col < ROW_LEN[r] and dx <= TOOTH_SIZE:
+                return LAYOUT[r][int(col)].num
+            return 0
+    return 0
+
+
+def hit(x: float, y: float) -> Tuple[int, int]:
+    """(número FDI, índice de cara) bajo el punto de escena, o (0, -1)."""
+    num = tooth_at(x, y)
+    if not num:
+        return 0, -1
+    return num, face_at(x - RECT_X[num], y - RECT_Y[num])
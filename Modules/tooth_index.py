@@ -0,0 +1,146 @@
+# coding: utf-8
+"""
+Modules/tooth_index.py
+
+Índice precalculado de piezas FDI, construido una sola vez desde
+`Modules.utils` (TEETH_ROWS, Y_POSITIONS, TOOTH_SIZE, …).
+
+Para cada número FDI se conoce: fila y columna del layout, cuadrante,
+arcada (superior / inferior), dentición (permanente / temporal),
+sector (anterior / posterior) y coordenadas de escena de su esquina
+superior izquierda.
+
+Dos formas de acceso:
+• `TOOTH_INFO[num]`  → `ToothInfo` (lookup O(1) por diente int).
+• Arrays planos indexados por número FDI (0-99, -1 = no existe):
+  `ROW_OF`, `COL_OF`, `X_OF`, `Y_OF`, `FLAGS_OF` (bits FLAG_*), útiles
+  para operaciones vectorizadas o bucles sin diccionarios.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Dict, FrozenSet, List, NamedTuple, Tuple
+
+from Modules.utils import (
+    TEETH_ROWS,
+    Y_POSITIONS,
+    TOOTH_SIZE,
+    TOOTH_MARGIN,
+    START_X,
+    TOP_PADDING,
+    BETWEEN_ROWS_EXTRA,
+)
+
+ARCH_UPPER = "superior"
+ARCH_LOWER = "inferior"
+
+# Bits de FLAGS_OF ----------------------------------------------------
+FLAG_UPPER    = 1      # arcada superior
+FLAG_PRIMARY  = 2      # dentición temporal (cuadrantes 5-8)
+FLAG_ANTERIOR = 4      # incisivos y caninos (unidades 1-3)
+
+
+class ToothInfo(NamedTuple):
+    num: int
+    row: int            # índice en TEETH_ROWS
+    col: int            # posición dentro de la fila
+    quadrant: int       # 1-8
+    arch: str           # ARCH_UPPER / ARCH_LOWER
+    primary: bool       # True = temporal
+    anterior: bool      # True = incisivo / canino
+    x: int              # esquina sup. izq. en la escena
+    y: int
+
+    @property
+    def upper(self) -> bool:
+        return self.arch == ARCH_UPPER
+
+    @property
+    def flags(self) -> int:
+        return ((FLAG_UPPER if self.upper else 0)
+                | (FLAG_PRIMARY if self.primary else 0)
+                | (FLAG_ANTERIOR if self.anterior else 0))
+
+
+# ─────────────────────────────────────────────────────────────
+# Construcción (una vez, al importar)
+# ─────────────────────────────────────────────────────────────
+def _row_origin(idx: int, row_len: int) -> Tuple[int, int]:
+    """(x de la primera pieza, y) de la fila `idx`, centrada horizontalmente."""
+    step = TOOTH_SIZE + TOOTH_MARGIN
+    base_width = max(len(r) for r in TEETH_ROWS) * step - TOOTH_MARGIN
+    row_w = row_len * step - TOOTH_MARGIN
+    offset_x = (base_width - row_w) // 2
+    y = Y_POSITIONS[idx] + TOP_PADDING + idx * BETWEEN_ROWS_EXTRA
+    return START_X + offset_x, y
+
+
+def _build() -> List[List[ToothInfo]]:
+    step = TOOTH_SIZE + TOOTH_MARGIN
+    layout: List[List[ToothInfo]] = []
+    for r, row in enumerate(TEETH_ROWS):
+        x0, y = _row_origin(r, len(row))
+        infos: List[ToothInfo] = []
+        for c, txt in enumerate(row):
+            num = int(txt)
+            quad, unit = divmod(num, 10)
+            infos.append(ToothInfo(
+                num=num,
+                row=r,
+                col=c,
+                quadrant=quad,
+                arch=ARCH_UPPER if quad in (1, 2, 5, 6) else ARCH_LOWER,
+                primary=quad >= 5,
+                anterior=unit <= 3,
+                x=x0 + c * step,
+                y=y,
+            ))
+        layout.append(infos)
+    return layout
+
+
+# Filas en orden de layout (mismo orden que TEETH_ROWS)
+LAYOUT: Tuple[Tuple[ToothInfo, ...], ...] = tuple(tuple(r) for r in _build())
+
+TOOTH_INFO: Dict[int, ToothInfo] = {t.num: t for row in LAYOUT for t in row}
+FDI_NUMBERS: Tuple[int, ...] = tuple(t.num for row in LAYOUT for t in row)
+VALID_TEETH: FrozenSet[int] = frozenset(TOOTH_INFO)
+
+# Arrays planos (índice = número FDI) ---------------------------------
+def _flat(typecode: str, attr: str) -> array:
+    arr = array(typecode, [-1] * 100)
+    for t in TOOTH_INFO.values():
+        arr[t.num] = getattr(t, attr)
+    return arr
+
+
+ROW_OF:   array = _flat("b", "row")
+COL_OF:   array = _flat("b", "col")
+X_OF:     array = _flat("h", "x")
+Y_OF:     array = _flat("h", "y")
+FLAGS_OF: array = _flat("b", "flags")
+
+
+# ─────────────────────────────────────────────────────────────
+# Consultas
+# ─────────────────────────────────────────────────────────────
+def is_valid(num: int) -> bool:
+    return num in VALID_TEETH
+
+
+def teeth_where(
+    *,
+    arch: str | None = None,
+    quadrant: int | None = None,
+    primary: bool | None = None,
+    anterior: bool | None = None,
+) -> Tuple[int, ...]:
+    """Números FDI (en orden de layout) que cumplen todos los criterios dados."""
+    return tuple(
+        t.num for row in LAYOUT for t in row
+        if (arch is None or t.arch == arch)
+        and (quadrant is None or t.quadrant == quadrant)
+        and (primary is None or t.primary == primary)
+        and (anterior is None or t.anterior == anterior)
+    )
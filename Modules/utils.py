@@ -7,43 +7,94 @@ azules de prótesis).
 
 import os
 import sys
-from typing import List
+from enum import IntEnum
+from typing import Dict, FrozenSet, Iterable, List
 
 # ─────────────────────────────────────────────────────────────
 # Estados y mapeos
 # ─────────────────────────────────────────────────────────────
-ESTADOS = {
-    "Ninguno": 0,
-    "Obturacion": 1,
-    "Agenesia": 2,
-    "PD Ausente": 3,
-    "Corona": 4,
-    "Implante": 5,
-    "Puente": 6,
-    "Selladores": 7,
-    "Ausente Fisiológico": 8,
+class Estado(IntEnum):
+    """Código entero de estado (el que viaja desde el SP hasta la escena)."""
+    NINGUNO = 0
+    OBTURACION = 1
+    AGENESIA = 2
+    PD_AUSENTE = 3
+    CORONA = 4
+    IMPLANTE = 5
+    PUENTE = 6
+    SELLADORES = 7
+    AUSENTE_FISIOLOGICO = 8
 
     # ---- Prótesis versión ROJA (histórica) ----------------
-    "Prótesis Removible SUPERIOR_R": 9,
-    "Prótesis Removible INFERIOR_R": 10,
-    "Prótesis Completa SUPERIOR_R": 11,
-    "Prótesis Completa INFERIOR_R": 12,
+    PRS_R = 9
+    PRI_R = 10
+    PCS_R = 11
+    PCI_R = 12
 
     # --------------------------------------------------------
-    "Caries": 13,
-    "Extracción": 14,
-    
+    CARIES = 13
+    EXTRACCION = 14
+
+    # ---- Prótesis versión AZUL (nueva) ---------------------
+    PRS_B = 15
+    PRI_B = 16
+    PCS_B = 17
+    PCI_B = 18
+
+
+# Nombre visible (sólo para textos de UI) → código
+ESTADOS: Dict[str, Estado] = {
+    "Ninguno": Estado.NINGUNO,
+    "Obturacion": Estado.OBTURACION,
+    "Agenesia": Estado.AGENESIA,
+    "PD Ausente": Estado.PD_AUSENTE,
+    "Corona": Estado.CORONA,
+    "Implante": Estado.IMPLANTE,
+    "Puente": Estado.PUENTE,
+    "Selladores": Estado.SELLADORES,
+    "Ausente Fisiológico": Estado.AUSENTE_FISIOLOGICO,
+
+    # ---- Prótesis versión ROJA (histórica) ----------------
+    "Prótesis Removible SUPERIOR_R": Estado.PRS_R,
+    "Prótesis Removible INFERIOR_R": Estado.PRI_R,
+    "Prótesis Completa SUPERIOR_R": Estado.PCS_R,
+    "Prótesis Completa INFERIOR_R": Estado.PCI_R,
+
+    # --------------------------------------------------------
+    "Caries": Estado.CARIES,
+    "Extracción": Estado.EXTRACCION,
+
     # ---- Prótesis versión AZUL (nueva) ---------------------
-    "Prótesis Removible SUPERIOR_B": 15,
-    "Prótesis Removible INFERIOR_B": 16,
-    "Prótesis Completa SUPERIOR_B": 17,
-    "Prótesis Completa INFERIOR_B": 18,
+    "Prótesis Removible SUPERIOR_B": Estado.PRS_B,
+    "Prótesis Removible INFERIOR_B": Estado.PRI_B,
+    "Prótesis Completa SUPERIOR_B": Estado.PCS_B,
+    "Prótesis Completa INFERIOR_B": Estado.PCI_B,
 }
 
 ESTADOS_POR_NUM = {v: k for k, v in ESTADOS.items()}
 
 MAX_STATE = 19   # rango máximo de estados
 
+
+# ─────────────────────────────────────────────────────────────
+# Conjuntos de estados como bitsets (bit n = código n)
+# ─────────────────────────────────────────────────────────────
+def state_mask(codes: Iterable[int]) -> int:
+    mask = 0
+    for c in codes:
+        mask |= 1 << c
+    return mask
+
+
+PROTESIS_ROJA: FrozenSet[Estado] = frozenset(
+    {Estado.PRS_R, Estado.PRI_R, Estado.PCS_R, Estado.PCI_R})
+PROTESIS_AZUL: FrozenSet[Estado] = frozenset(
+    {Estado.PRS_B, Estado.PRI_B, Estado.PCS_B, Estado.PCI_B})
+
+# Prestaciones “requeridas” (el resto son existentes)
+REQUERIDAS_CODES: FrozenSet[Estado] = PROTESIS_AZUL | {Estado.CARIES, Estado.EXTRACCION}
+REQUERIDAS_MASK: int = state_mask(REQUERIDAS_CODES)
+
 # ─────────────────────────────────────────────────────────────
 # Abreviaturas para texto de prótesis (ambas variantes → mismo label)
 # ─────────────────────────────────────────────────────────────
@@ -87,6 +138,11 @@ Y_POSITIONS: List[int] = [
     START_Y + GAP_ADULT + GAP_CHILD_BLOCK + GAP_CHILD,
 ]
 
+# 3) Desplazamientos de la escena (filas centradas respecto a la más ancha)
+START_X            = 50
+TOP_PADDING        = -10
+BETWEEN_ROWS_EXTRA = 60
+
 # Formato anterior (conservado sólo como referencia)
 # TEETH_ROWS_OLD …
 # Y_POSITIONS_OLD …
@@ -18,9 +18,9 @@ Todos los comentarios originales se conservan; lo añadido se marca con “NEW
 from __future__ import annotations
 
 import os
-from typing import Any, List, Mapping, Tuple, cast
+from typing import Any, Dict, Generator, List, Mapping, Tuple, cast
 
-from PyQt5.QtCore    import Qt, QSize
+from PyQt5.QtCore    import Qt, QSize, QTimer
 from PyQt5.QtGui     import (
     QColor,
     QFont,
@@ -53,14 +53,17 @@ from Modules.conexion_db   import get_bocas_consulta_efector, get_odontograma_da
 from Modules.menubox_prest import (
     get_menu_existentes,
     get_menu_requeridas,
-    REQUERIDAS_FULL_SET,
 )
 from Modules.modelos_sin_imagenes import OdontogramView
-from Modules.utils         import resource_path, ESTADOS_POR_NUM
+from Modules.boca_cache    import BocaCache, BocaSnapshot
+from Modules.filters       import pack, precompute_modes
+from Modules.utils         import resource_path
 from Utils.sp_data_parse   import parse_dientes_sp
 from Utils.actions         import capture_odontogram
 from Utils.center_window   import center_on_screen
 from Styles.animation      import apply_button_colorize_animation
+from Styles                import low_bandwidth
+from Utils.idle_scheduler  import PRIO_PREFETCH, idle_scheduler
 from Styles                import style                     # NEW – reaplica QSS escalable
 
 # ════════════════════════════════════════════════════════════
@@ -72,6 +75,15 @@ class MainWindow(QMainWindow):
     _LOWRES_SCALE    = 0.80          # factor en pantallas pequeñas
     _HIRES_SCALE     = 1.00          # factor habitual
 
+    # ─────── Cache de odontogramas por (idBoca, filtro) ───────
+    _BOCA_CACHE_ENTRIES = 16         # 0 = sin cache
+    _BOCA_CACHE_KB      = 512        # tope de memoria aproximada
+    # ODONTO_CACHE_LOG=1 → una línea [INFO] por acierto de cache (diagnóstico)
+    _BOCA_CACHE_LOG     = os.getenv("ODONTO_CACHE_LOG", "").strip() not in ("", "0")
+
+    # ─────── Prefetch de la boca vecina ───────
+    _PREFETCH_DELAY_MS  = 400        # selección estable antes de consultar la BD
+
     # --------------------------------------------------------
     def __init__(self, data: Mapping[str, Any]) -> None:
         super().__init__()
@@ -95,6 +107,19 @@ class MainWindow(QMainWindow):
         self.locked = bool(data.get("locked", False))
         self.current_idboca: int | None = None
         self.raw_states: List[Tuple[int, int, str]] = []
+        # estados visibles por modo de filtro (se calculan una vez por boca)
+        self._by_mode: Dict[int, List[Tuple[int, int, str]]] = {}
+        self._data: Dict[str, Any] = {}              # encabezado de la boca actual
+        self._boca_cache = BocaCache(self._BOCA_CACHE_ENTRIES, self._BOCA_CACHE_KB)
+        self._current_row = -1
+        # boca vecina pre-cargada en tiempo ocioso: (idBoca, data, estados, por modo)
+        self._prefetched: Tuple[int, dict, List[Tuple[int, int, str]],
+                                Dict[int, List[Tuple[int, int, str]]]] | None = None
+        # debounce: recorrer la tabla con las flechas no dispara consultas
+        self._prefetch_timer = QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.setInterval(self._PREFETCH_DELAY_MS)
+        self._prefetch_timer.timeout.connect(self._submit_prefetch)
 
         # —— icono ——
         ico = resource_path("src/icon.png")
@@ -118,6 +143,8 @@ class MainWindow(QMainWindow):
         self.tabs = self._build_tabs(filas_bocas)
         self.tabs.setFixedWidth(int(320 * self._scale_factor))             # NEW
         self.grp_filtro = self._build_filter_radios()
+        # la entrada en la tabla / el odontograma posterga el trabajo ocioso
+        idle_scheduler().watch_input(self.tableBocas, self.odontogram_view)
 
         # —— Botón descargar ——
         btn_download = QToolButton(self)
@@ -134,7 +161,10 @@ class MainWindow(QMainWindow):
             btn_download.setText("💾")
 
         btn_download.clicked.connect(self._do_download)
-        apply_button_colorize_animation(btn_download)
+        if low_bandwidth.enabled():
+            low_bandwidth.apply_button_static_hover(btn_download)      # sin animación
+        else:
+            apply_button_colorize_animation(btn_download)
 
         # —— Layout canvas + botón ——
         odo_box = QVBoxLayout()
@@ -231,11 +261,16 @@ class MainWindow(QMainWindow):
 
         hdr.setLayout(grid)
         self.header_frame = hdr
+        if low_bandwidth.enabled():
+            self._bake_key_shadows(hdr)
 
     def _key(self, txt: str, f: QFont) -> QLabel:
         lbl = QLabel(txt)
         lbl.setFont(f)
         lbl.setStyleSheet("color:white;")
+        if low_bandwidth.enabled():
+            lbl.setProperty("shadowKey", True)    # sombra horneada en _bake_key_shadows
+            return lbl
         eff = QGraphicsDropShadowEffect()
         eff.setBlurRadius(6)
         eff.setOffset(0, 0)
@@ -243,6 +278,21 @@ class MainWindow(QMainWindow):
         lbl.setGraphicsEffect(eff)
         return lbl
 
+    @staticmethod
+    def _bake_key_shadows(hdr: QFrame) -> None:
+        """
+        Modo bajo ancho de banda: los rótulos pasan a un pixmap estático con
+        la sombra ya dibujada (el QGraphicsDropShadowEffect repinta su área
+        completa con cada cambio del header). Se hace con el QSS ya aplicado
+        para usar la fuente y el color efectivos.
+        """
+        for lbl in hdr.findChildren(QLabel):
+            if not lbl.property("shadowKey"):
+                continue
+            lbl.ensurePolished()
+            lbl.setPixmap(low_bandwidth.shadow_text_pixmap(
+                lbl.text(), lbl.font(), lbl.palette().color(lbl.foregroundRole())))
+
     def _val_lbl(self, *, word_wrap=False) -> QLabel:
         lbl = QLabel()
         lbl.setWordWrap(word_wrap)
@@ -350,32 +400,116 @@ class MainWindow(QMainWindow):
         itm = self.tableBocas.item(row, 0)
         if not (itm and itm.text().isdigit()):
             return
-        self.current_idboca = int(itm.text())
-        data = get_odontograma_data(self.current_idboca)
+        idboca = int(itm.text())
+        if idboca == self.current_idboca and row == self._current_row:
+            return          # clic = currentCellChanged + cellClicked: ya está en pantalla
+        self.current_idboca = idboca
+        self._current_row = row
+        # boca reciente: encabezado, estados y modelo salen del cache (sin BD)
+        snap = self._boca_cache.get(self.current_idboca, self.filter_group.checkedId())
+        pre = self._prefetched
+        if snap is not None:
+            data = snap.data
+            self.raw_states = list(snap.raw)
+            self._by_mode = {}                     # se calcula si cambia el filtro
+        elif pre is not None and pre[0] == self.current_idboca:
+            _id, data, self.raw_states, self._by_mode = pre
+            self._prefetched = None
+        else:
+            data = get_odontograma_data(self.current_idboca)
+            self.raw_states = parse_dientes_sp(
+                str(data.get("dientes", "")), context=f"idBoca={self.current_idboca}"
+            )
+            self._by_mode = precompute_modes(pack(self.raw_states))
+        self._data = data
 
         self.lblCredValue.setText(str(data.get("credencial", "")))
         self.lblAfilValue.setText(str(data.get("afiliado", "")))
         self.lblPrestValue.setText(str(data.get("prestador", "")))
         self.lblFechaValue.setText(str(data.get("fecha", "")))
         self.lblObsValue.setText(str(data.get("observaciones", "")))
-
-        self.raw_states = parse_dientes_sp(str(data.get("dientes", "")))
-        self._reapply_filter()
+        self._show_filtered(snap)
+        # el prefetch anterior ya no sirve; el nuevo espera a que la selección se asiente
+        idle_scheduler().cancel("prefetch_boca")
+        self._prefetch_timer.start()
+
+    def _neighbour_idboca(self) -> int | None:
+        """idBoca de la fila siguiente (o la anterior si es la última)."""
+        rows = self.tableBocas.rowCount()
+        row = self._current_row + 1 if self._current_row + 1 < rows else self._current_row - 1
+        itm = self.tableBocas.item(row, 0) if row >= 0 else None
+        return int(itm.text()) if itm and itm.text().isdigit() else None
+
+    def _neighbour_ready(self, idboca: int) -> bool:
+        """True si la boca vecina ya está en cache, en el back-buffer o pre-cargada."""
+        mode = self.filter_group.checkedId()
+        pre = self._prefetched
+        return ((idboca, mode) in self._boca_cache
+                or self.odontogram_view.has_back((idboca, mode))
+                or (pre is not None and pre[0] == idboca))
+
+    def _submit_prefetch(self) -> None:
+        """
+        Fin del debounce: encola el prefetch sólo si la vecina no está ya
+        resuelta (cada prefetch es una consulta más a la BD).
+        """
+        idboca = self._neighbour_idboca()
+        if idboca is None or self._neighbour_ready(idboca):
+            return
+        idle_scheduler().submit(self._prefetch_neighbour(), priority=PRIO_PREFETCH,
+                                key="prefetch_boca", name="prefetch_boca")
+
+    def _prefetch_neighbour(self) -> Generator[object, Any, None]:
+        """
+        Tarea ociosa (Utils.idle_scheduler): lee y resuelve la boca de la
+        fila siguiente (o la anterior si es la última) en el back-buffer del
+        odontograma; al seleccionarla sólo se intercambia el modelo.  La
+        consulta corre en el hilo de E/S del planificador (con su propia
+        conexión); parseo, filtros y back-buffer son pasos en el hilo GUI.
+        Se cancela si el usuario selecciona otra boca antes de terminar.
+        """
+        idboca = self._neighbour_idboca()
+        if idboca is None or self._neighbour_ready(idboca):
+            return
+        mode = self.filter_group.checkedId()
+        sched = idle_scheduler()
+        try:
+            data = yield sched.run_in_worker(get_odontograma_data, idboca)
+        except Exception as e:
+            print("[WARN] prefetch idBoca", idboca, e)
+            return
+        raw = parse_dientes_sp(str(data.get("dientes", "")), context=f"idBoca={idboca}")
+        yield
+        by_mode = precompute_modes(pack(raw))
+        yield
+        self._prefetched = (idboca, data, raw, by_mode)
+        self.odontogram_view.prepare_back((idboca, mode), by_mode[mode])
 
     def _reapply_filter(self) -> None:
+        idboca = self.current_idboca
+        mode = self.filter_group.checkedId()
+        self._show_filtered(self._boca_cache.get(idboca, mode) if idboca is not None else None)
+
+    def _show_filtered(self, snap: BocaSnapshot | None) -> None:
+        """Muestra la boca actual con el filtro elegido (`snap` = entrada de cache)."""
         if not self.raw_states:
             return
         mode = self.filter_group.checkedId()
-        flt = (
-            (lambda n: True)
-            if mode == 0
-            else (lambda n: ESTADOS_POR_NUM[n] not in REQUERIDAS_FULL_SET)
-            if mode == 1
-            else (lambda n: ESTADOS_POR_NUM[n] in REQUERIDAS_FULL_SET)
-        )
-        self.odontogram_view.apply_batch_states(
-            [s for s in self.raw_states if flt(s[0])]
-        )
+        idboca = self.current_idboca
+        if snap is not None:
+            self.odontogram_view.restore(snap.model, snap.states)
+            if self._BOCA_CACHE_LOG:
+                print(f"[INFO] idBoca={idboca} desde cache ({self._boca_cache.report()})")
+            return
+
+        if not self._by_mode:
+            self._by_mode = precompute_modes(pack(self.raw_states))
+        if not self.odontogram_view.swap_back((idboca, mode)):
+            self.odontogram_view.apply_batch_states(self._by_mode[mode])
+        if idboca is not None:
+            self._boca_cache.put(idboca, mode, self.odontogram_view.freeze_model(),
+                                 self.odontogram_view.states,
+                                 data=self._data, raw=self.raw_states)
 
     def _on_estado_clicked(self, estado: str) -> None:
         self.odontogram_view.set_current_state(estado)
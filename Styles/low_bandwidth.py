@@ -0,0 +1,177 @@
+# coding: utf-8
+"""
+Modo “bajo ancho de banda” para sesiones de escritorio remoto (RDP / Citrix).
+
+Cada repintado viaja por la red, así que en este modo:
+• los efectos (sombra de los rótulos del header, tinte animado del botón
+  de descarga) se reemplazan por pixmaps estáticos pre-renderizados;
+• no hay animaciones (el splash muestra sólo el primer cuadro del GIF);
+• los degradados del QSS pasan a colores planos;
+• el odontograma usa el perfil de render "lowbw" (sólo la región cambiada).
+
+Activación:
+    ODONTO_LOW_BANDWIDTH=1 / 0   fuerza encendido / apagado
+    (sin la variable)            automático si SESSIONNAME empieza con
+                                 RDP- o ICA- (sesión remota en Windows)
+
+`RepaintMeter` cuenta eventos de pintado y píxeles repintados de un widget
+(`python -m Utils.benchmarks lowbw` compara ambos modos).
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Dict, Optional, Tuple
+
+from PyQt5.QtCore import QEvent, QObject, QPoint, Qt
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QIcon, QPainter, QPixmap
+from PyQt5.QtWidgets import QToolButton, QWidget
+
+ENV_VAR = "ODONTO_LOW_BANDWIDTH"
+REMOTE_PREFIXES = ("RDP-", "ICA-")
+
+_enabled: Optional[bool] = None
+
+
+def detect() -> bool:
+    """Lee ODONTO_LOW_BANDWIDTH o, si no está, detecta una sesión remota."""
+    env = os.getenv(ENV_VAR)
+    if env is not None and env.strip():
+        return env.strip().lower() not in ("0", "no", "false", "off")
+    session = os.getenv("SESSIONNAME", "").upper()
+    return session.startswith(REMOTE_PREFIXES)
+
+
+def enabled() -> bool:
+    global _enabled
+    if _enabled is None:
+        _enabled = detect()
+        if _enabled:
+            print("[INFO] Modo bajo ancho de banda activo (sesión remota o "
+                  f"{ENV_VAR})")
+    return _enabled
+
+
+def set_enabled(flag: Optional[bool]) -> None:
+    """Fuerza el modo (None = volver a detectar en el próximo `enabled()`)."""
+    global _enabled
+    _enabled = flag
+
+
+# ─────────────────────────────────────────────────────────────
+# Pixmaps estáticos (reemplazo de efectos)
+# ─────────────────────────────────────────────────────────────
+_SHADOW_CACHE: Dict[Tuple[str, str, int, int], QPixmap] = {}
+
+
+def shadow_text_pixmap(
+    text: str,
+    font: QFont,
+    color: QColor,
+    shadow: QColor = QColor(0, 0, 0, 180),
+    radius: int = 2,
+) -> QPixmap:
+    """
+    Texto con halo de sombra ya “horneado” (equivalente aproximado a un
+    QGraphicsDropShadowEffect de offset 0): se dibuja una vez y se reutiliza.
+    """
+    key = (text, font.key(), color.rgba(), shadow.rgba())
+    pix = _SHADOW_CACHE.get(key)
+    if pix is not None:
+        return pix
+
+    fm = QFontMetrics(font)
+    pix = QPixmap(fm.horizontalAdvance(text) + 2 * radius, fm.height() + 2 * radius)
+    pix.fill(Qt.transparent)  # type: ignore[attr-defined]
+    p = QPainter(pix)
+    p.setFont(font)
+    base = QPoint(radius, radius + fm.ascent())
+    halo = QColor(shadow)
+    halo.setAlpha(max(1, shadow.alpha() // 3))
+    p.setPen(halo)
+    for dx in range(-radius, radius + 1):
+        for dy in range(-radius, radius + 1):
+            if dx or dy:
+                p.drawText(base + QPoint(dx, dy), text)
+    p.setPen(color)
+    p.drawText(base, text)
+    p.end()
+    _SHADOW_CACHE[key] = pix
+    return pix
+
+
+def tinted_pixmap(pix: QPixmap, color: QColor, strength: float) -> QPixmap:
+    """Copia de `pix` teñida (como QGraphicsColorizeEffect con `strength`)."""
+    out = QPixmap(pix)
+    tint = QColor(color)
+    tint.setAlphaF(max(0.0, min(1.0, strength)))
+    p = QPainter(out)
+    p.setCompositionMode(QPainter.CompositionMode_SourceAtop)
+    p.fillRect(out.rect(), tint)
+    p.end()
+    return out
+
+
+class _HoverSwap(QObject):
+    """Cambia el ícono del botón al entrar / salir el mouse (sin animación)."""
+
+    def __init__(self, button: QToolButton, normal: QIcon, hover: QIcon) -> None:
+        super().__init__(button)
+        self._normal, self._hover = normal, hover
+        button.installEventFilter(self)
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:  # type: ignore[override]
+        if event.type() == QEvent.Enter:
+            obj.setIcon(self._hover)              # type: ignore[attr-defined]
+        elif event.type() == QEvent.Leave:
+            obj.setIcon(self._normal)             # type: ignore[attr-defined]
+        return False
+
+
+def apply_button_static_hover(
+    button: QToolButton,
+    color: QColor = QColor("#4682b4"),
+    strength: float = 0.7,
+) -> None:
+    """
+    Equivalente estático de `Styles.animation.apply_button_colorize_animation`:
+    el ícono teñido se pre-renderiza y se alterna en hover (2 repintados del
+    botón en lugar de una animación de 300 ms).
+    """
+    icon = button.icon()
+    if icon.isNull():
+        return
+    size = button.iconSize()
+    normal = icon.pixmap(size)
+    button._hover_swap = _HoverSwap(               # type: ignore[attr-defined]
+        button, QIcon(normal), QIcon(tinted_pixmap(normal, color, strength)))
+
+
+# ─────────────────────────────────────────────────────────────
+# Medición de repintados
+# ─────────────────────────────────────────────────────────────
+class RepaintMeter(QObject):
+    """Cuenta eventos Paint y píxeles (área de la región) de los widgets observados."""
+
+    def __init__(self, *widgets: QWidget) -> None:
+        super().__init__()
+        self.events = 0
+        self.pixels = 0
+        for w in widgets:
+            self.watch(w)
+
+    def watch(self, widget: QWidget, *, children: bool = False) -> None:
+        widget.installEventFilter(self)
+        if children:
+            for child in widget.findChildren(QWidget):
+                child.installEventFilter(self)
+
+    def reset(self) -> None:
+        self.events = self.pixels = 0
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:  # type: ignore[override]
+        if event.type() == QEvent.Paint:
+            self.events += 1
+            self.pixels += sum(r.width() * r.height()
+                               for r in event.region().rects())  # type: ignore[attr-defined]
+        return False
@@ -0,0 +1,75 @@
+# coding: utf-8
+"""
+Perfiles de render del odontograma (QGraphicsView / QGraphicsScene).
+
+    default – valores de Qt (sin cache por item, MinimalViewportUpdate,
+              índice BSP, sin flags de optimización)
+    tuned   – cache DeviceCoordinateCache en las piezas, una sola región
+              por repintado (BoundingRectViewportUpdate), sin save/restore
+              del painter por item y escena sin índice (≈ 60 items fijos)
+    lowbw   – como "tuned" pero repintando sólo las regiones cambiadas
+              (MinimalViewportUpdate): menos píxeles por la red en sesiones
+              remotas; es el default si Styles.low_bandwidth está activo
+
+Se elige con la variable de entorno ODONTO_RENDER_PROFILE o con el
+parámetro `render_profile` de OdontogramView; `python -m Utils.benchmarks
+render` compara los tiempos de pintado de cada perfil.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Dict, NamedTuple
+
+from PyQt5.QtWidgets import QGraphicsItem, QGraphicsScene, QGraphicsView
+
+from Styles import low_bandwidth
+
+
+class RenderProfile(NamedTuple):
+    item_cache: QGraphicsItem.CacheMode
+    update_mode: QGraphicsView.ViewportUpdateMode
+    optimization: int                      # QGraphicsView.OptimizationFlags
+    index: QGraphicsScene.ItemIndexMethod
+
+
+PROFILES: Dict[str, RenderProfile] = {
+    "default": RenderProfile(
+        QGraphicsItem.NoCache,
+        QGraphicsView.MinimalViewportUpdate,
+        0,
+        QGraphicsScene.BspTreeIndex,
+    ),
+    "tuned": RenderProfile(
+        QGraphicsItem.DeviceCoordinateCache,
+        QGraphicsView.BoundingRectViewportUpdate,
+        int(QGraphicsView.DontSavePainterState | QGraphicsView.DontAdjustForAntialiasing),
+        QGraphicsScene.NoIndex,
+    ),
+    "lowbw": RenderProfile(
+        QGraphicsItem.DeviceCoordinateCache,
+        QGraphicsView.MinimalViewportUpdate,
+        int(QGraphicsView.DontSavePainterState | QGraphicsView.DontAdjustForAntialiasing),
+        QGraphicsScene.NoIndex,
+    ),
+}
+
+DEFAULT_PROFILE = "tuned"
+ENV_VAR = "ODONTO_RENDER_PROFILE"
+
+
+def profile_name(name: str | None = None) -> str:
+    """
+    Nombre efectivo: `name`, si no la variable de entorno, si no "lowbw"
+    (modo bajo ancho de banda) o el default.
+    """
+    name = name or os.getenv(ENV_VAR) or (
+        "lowbw" if low_bandwidth.enabled() else DEFAULT_PROFILE)
+    if name not in PROFILES:
+        print(f"[WARN] Perfil de render desconocido: {name} (opciones: {', '.join(PROFILES)})")
+        name = DEFAULT_PROFILE
+    return name
+
+
+def get_profile(name: str | None = None) -> RenderProfile:
+    return PROFILES[profile_name(name)]
@@ -13,6 +13,8 @@ NEW 2025-08-01
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtGui     import QGuiApplication
 
+from Styles import low_bandwidth
+
 
 # --- PALETA DEL HEADER (IMITANDO LA IMAGEN CON DEGRADADO) ---
 HEADER_GRADIENT_START = "#457aaf"
@@ -43,13 +45,20 @@ def _auto_scale() -> float:
     return _HIRES_SCALE
 
 
-def apply_style(app: QApplication | None, *, scale: float | None = None) -> None:
+def apply_style(
+    app: QApplication | None,
+    *,
+    scale: float | None = None,
+    low_bandwidth_mode: bool | None = None,
+) -> None:
     """
     Aplica una hoja de estilos QSS global.
     Parámetros
     ----------
     app     : QApplication   (puede ser None si ya existe)
     scale   : float | None   factor externo; si None se autodetecta.
+    low_bandwidth_mode : bool | None   colores planos en vez de degradados
+              (sesiones remotas); si None se usa `low_bandwidth.enabled()`.
     """
     if app is None:
         app = QApplication.instance() # type: ignore[arg-type]
@@ -57,6 +66,13 @@ def apply_style(app: QApplication | None, *, scale: float | None = None) -> None
             raise RuntimeError("No hay QApplication en ejecución")
 
     scale = scale or _auto_scale()
+    if low_bandwidth_mode is None:
+        low_bandwidth_mode = low_bandwidth.enabled()
+
+    # Fondo del header: degradado, o plano en modo bajo ancho de banda
+    HEADER_BG = (HEADER_GRADIENT_START if low_bandwidth_mode else
+                 "qlineargradient(x1:0, y1:0, x2:1, y2:0, "
+                 f"stop:0 {HEADER_GRADIENT_START}, stop:1 {HEADER_GRADIENT_END})")
 
     # Font-sizes base según factor
     BASE_FONT   = max(8, int(11 * scale))
@@ -84,8 +100,7 @@ def apply_style(app: QApplication | None, *, scale: float | None = None) -> None
 
         /* -------- HEADER (gradiente) -------- */
         QFrame#headerFrame {{
-            background-color: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                                              stop:0 {HEADER_GRADIENT_START}, stop:1 {HEADER_GRADIENT_END});
+            background-color: {HEADER_BG};
             border-radius: 8px;
             padding: {PAD_BTN}px;
             border: 2px solid {HEADER_BORDER};
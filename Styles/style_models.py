@@ -4,10 +4,10 @@ Paleta y estilos gráficos para los modelos del odontograma.
 Compatible con PyQt5 y PyQt6, sin que Pylance se queje.
 """
 
-from typing import Final
+from typing import Dict, Final
 
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QBrush, QPen
+from PyQt5.QtGui import QBrush, QFont, QPen
 
 # ─────────────────────────────────────────────────────────────
 # Aliases de colores
@@ -32,28 +32,88 @@ TRANSPARENT_COLOR = getattr(
     getattr(Qt.GlobalColor, "transparent")  # PyQt6
 )
 
+BLACK: Final  = getattr(Qt, "black", Qt.GlobalColor.black)  # ← NUEVO
+
+# ─────────────────────────────────────────────────────────────
+# Registro flyweight: plumas, brochas y fuentes por clave semántica
+# ─────────────────────────────────────────────────────────────
+# Cada objeto se crea una sola vez al importar.  El registro es privado:
+# pen()/brush()/font() devuelven copias, que Qt comparte implícitamente
+# (copy-on-write) con el original, así que copiar no duplica datos y
+# mutar la copia no altera el registro ni a las demás piezas.
+_PENS: Final[Dict[str, QPen]] = {
+    # trazos
+    "outline":     QPen(BLACK, 2),            # contorno de la pieza
+    "blue":        QPen(BLUE,  3),            # extracción / supernumerario
+    "yellow":      QPen(YELLOW, 2),
+    "blue_dot":    QPen(BLUE,  2, DOT_LINE_STYLE),
+    "bridge":      QPen(BLUE,  4),
+    "red":         QPen(RED,   2),            # corona / sellador
+    "red_dot":     QPen(RED,   2, DOT_LINE_STYLE),
+    "red_bridge":  QPen(RED,   3),            # línea de puente
+    "pd_line":     QPen(RED,   4),            # PD ausente
+    "prot_red":    QPen(RED,   2),            # llave de prótesis por arcada
+    "prot_blue":   QPen(BLUE,  2),
+    # texto
+    "text_black":  QPen(BLACK),
+    "text_red":    QPen(RED),
+    "text_blue":   QPen(BLUE),
+}
+
+_BRUSHES: Final[Dict[str, QBrush]] = {
+    "white":       QBrush(WHITE),
+    "blue":        QBrush(BLUE),
+    "yellow":      QBrush(YELLOW),
+    "red":         QBrush(RED),
+    "gray":        QBrush(DARK_GRAY),         # agenesia
+    "transparent": QBrush(TRANSPARENT_COLOR),
+}
+
+_FONTS: Final[Dict[str, QFont]] = {
+    "tooth_number": QFont("Arial", 10),
+    "implant":      QFont("Arial", 10, QFont.Bold),
+    "supernum":     QFont("Arial", 12, QFont.Bold),
+    "prosthesis":   QFont("Arial", 12, QFont.Bold),
+}
+
+
+def pen(key: str) -> QPen:
+    """Copia (implícitamente compartida) de la pluma `key`."""
+    return QPen(_PENS[key])
+
+
+def brush(key: str) -> QBrush:
+    """Copia (implícitamente compartida) de la brocha `key`."""
+    return QBrush(_BRUSHES[key])
+
+
+def font(key: str) -> QFont:
+    """Copia (implícitamente compartida) de la fuente `key`."""
+    return QFont(_FONTS[key])
+
+
 # ─────────────────────────────────────────────────────────────
 # Plumas
 # ─────────────────────────────────────────────────────────────
-BLUE_PEN: Final     = QPen(BLUE,   3)
-YELLOW_PEN: Final   = QPen(YELLOW, 2)
-DOT_BLUE_PEN: Final = QPen(BLUE,   2, DOT_LINE_STYLE)
-BRIDGE_PEN: Final   = QPen(BLUE,   4)
+BLUE_PEN: Final     = pen("blue")
+YELLOW_PEN: Final   = pen("yellow")
+DOT_BLUE_PEN: Final = pen("blue_dot")
+BRIDGE_PEN: Final   = pen("bridge")
 
 # ─────────────────────────────────────────────────────────────
 # Brochas
 # ─────────────────────────────────────────────────────────────
-WHITE_BRUSH: Final       = QBrush(WHITE)
-BLUE_BRUSH: Final        = QBrush(BLUE)
-YELLOW_BRUSH: Final      = QBrush(YELLOW)
-TRANSPARENT_BRUSH: Final = QBrush(TRANSPARENT_COLOR)
+WHITE_BRUSH: Final       = brush("white")
+BLUE_BRUSH: Final        = brush("blue")
+YELLOW_BRUSH: Final      = brush("yellow")
+TRANSPARENT_BRUSH: Final = brush("transparent")
 
-BLACK: Final  = getattr(Qt, "black", Qt.GlobalColor.black)  # ← NUEVO
 # ─────────────────────────────────────────────────────────────
 # Exportación explícita (ayuda adicional a Pylance)
 # ─────────────────────────────────────────────────────────────
 __all__ = [
-    "BLUE", "YELLOW", "WHITE", "RED", "DARK_GRAY", "DARK_YELLOW",
+    "BLUE", "YELLOW", "WHITE", "RED", "BLACK", "DARK_GRAY", "DARK_YELLOW",
     "BLUE_PEN", "YELLOW_PEN", "DOT_BLUE_PEN", "BRIDGE_PEN",
     "WHITE_BRUSH", "BLUE_BRUSH", "YELLOW_BRUSH", "TRANSPARENT_BRUSH",
+    "pen", "brush", "font",
 ]
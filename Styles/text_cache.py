@@ -0,0 +1,63 @@
+# coding: utf-8
+"""
+Cache compartido de textos estáticos para la escena del odontograma.
+
+Los rótulos del odontograma (números de pieza, “IMP”, “S”, PRS/PCS/…)
+son pocos y se repiten en todas las piezas y todas las vistas.  En vez
+de un QGraphicsTextItem (con su QTextDocument) por rótulo, se pintan con
+`QStaticText` ya preparados; glifos y métricas se calculan una vez por
+par (texto, fuente).
+"""
+
+from __future__ import annotations
+
+from typing import Dict, NamedTuple, Tuple
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont, QFontMetricsF, QStaticText, QTransform
+
+
+class TextMetrics(NamedTuple):
+    width: float
+    height: float
+    ascent: float
+
+
+_STATIC: Dict[Tuple[str, str], QStaticText] = {}
+_METRICS: Dict[Tuple[str, str], TextMetrics] = {}
+_FONT_METRICS: Dict[str, QFontMetricsF] = {}
+
+
+def _font_metrics(font: QFont) -> QFontMetricsF:
+    key = font.key()
+    fm = _FONT_METRICS.get(key)
+    if fm is None:
+        fm = _FONT_METRICS[key] = QFontMetricsF(font)
+    return fm
+
+
+def static_text(text: str, font: QFont) -> QStaticText:
+    """QStaticText preparado para `font` (se reutiliza entre piezas y vistas)."""
+    key = (text, font.key())
+    st = _STATIC.get(key)
+    if st is None:
+        st = QStaticText(text)
+        st.setTextFormat(Qt.PlainText)  # type: ignore[attr-defined]
+        st.prepare(QTransform(), font)
+        _STATIC[key] = st
+    return st
+
+
+def text_metrics(text: str, font: QFont) -> TextMetrics:
+    """Ancho, alto y ascent de `text` con `font` (cacheado)."""
+    key = (text, font.key())
+    m = _METRICS.get(key)
+    if m is None:
+        fm = _font_metrics(font)
+        m = _METRICS[key] = TextMetrics(fm.horizontalAdvance(text), fm.height(), fm.ascent())
+    return m
+
+
+def cache_info() -> Dict[str, int]:
+    """Tamaño de los caches (para benchmarks)."""
+    return {"static": len(_STATIC), "metrics": len(_METRICS), "fonts": len(_FONT_METRICS)}
@@ -0,0 +1,444 @@
+#Utils/benchmarks.py
+# coding: utf-8
+"""
+Micro-benchmarks del odontograma (construcción, apply y repintado).
+
+    python -m Utils.benchmarks            # todos
+    python -m Utils.benchmarks view       # sólo OdontogramView
+    python -m Utils.benchmarks boca       # navegación entre bocas (cache)
+    python -m Utils.benchmarks apply      # throughput del modelo (sin Qt)
+    python -m Utils.benchmarks batch      # batch_update vs. invalidación por pieza
+    python -m Utils.benchmarks render     # perfiles de render (Styles.render_profile)
+    python -m Utils.benchmarks lowbw      # píxeles repintados: normal vs. bajo ancho de banda
+    python -m Utils.benchmarks hit        # hit-testing de clics: tablas vs. lookup de Qt
+    python -m Utils.benchmarks idle       # planificador ocioso: bloqueo máximo del event loop
+
+Corre con QT_QPA_PLATFORM=offscreen si no hay display.  Los tiempos son
+promedios en milisegundos; sirven para comparar antes/después de un
+cambio en la misma máquina, no como valores absolutos.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+# Muestra del README + prótesis y puentes (≈ una boca “cargada”)
+SAMPLE_DIENTES = (
+    "111,212V,313D,414MD,515O,616VI,717V,818,125,225,326,437,548,651,661,662,"
+    "752,863,974,1085,1147,1245,1342,1341,135OLP,653,654,655,1521,1736,1855,"
+    "1144,1145,1746,1648"
+)
+
+
+def _timeit(fn: Callable[[], object], repeat: int) -> float:
+    """Promedio en ms de `repeat` llamadas."""
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) * 1000 / repeat
+
+
+_APP = None  # referencia fuerte: si el GC destruye la QApplication, los caches de texto quedan colgando
+
+
+def _ensure_app():
+    global _APP
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    if QApplication.instance() is None:
+        _APP = QApplication(sys.argv[:1])
+    return QApplication.instance()
+
+
+# ─────────────────────────────────────────────────────────────
+# OdontogramView
+# ─────────────────────────────────────────────────────────────
+def bench_view(repeat: int = 20, raw: str = SAMPLE_DIENTES) -> Dict[str, float]:
+    """Construcción, apply (alternando boca llena / vacía) y repintado."""
+    app = _ensure_app()
+    from PyQt5.QtGui import QImage, QPainter
+    from Modules.modelos_sin_imagenes import OdontogramView
+    from Utils.sp_data_parse import parse_dientes_sp
+
+    states = parse_dientes_sp(raw)
+    views: List[OdontogramView] = []
+    build = _timeit(lambda: views.append(OdontogramView(locked=True)), repeat)
+
+    # memoria Python (tracemalloc no ve la memoria C++ de Qt) de una vista
+    tracemalloc.start()
+    snap = tracemalloc.take_snapshot()
+    extra = OdontogramView(locked=True)
+    extra.apply_batch_states(states)
+    build_kb = sum(s.size_diff for s in
+                   tracemalloc.take_snapshot().compare_to(snap, "filename")) / 1024
+    tracemalloc.stop()
+
+    view = views[-1]
+    view.resize(900, 600)
+    app.processEvents()
+
+    flip = [states, []]
+    apply_full = _timeit(lambda: (view.apply_batch_states(flip[0]), flip.reverse()), repeat)
+    view.apply_batch_states(states)
+    apply_same = _timeit(lambda: view.apply_batch_states(states), repeat)
+
+    img = QImage(900, 600, QImage.Format_ARGB32_Premultiplied)
+
+    def _paint() -> None:
+        p = QPainter(img)
+        view.render(p)
+        p.end()
+
+    repaint = _timeit(_paint, repeat)
+    scene = view.scene()
+    return {
+        "items": float(len(scene.items()) if scene else 0),
+        "build_ms": build,
+        "build_py_kb": build_kb,
+        "apply_ms": apply_full,
+        "apply_same_ms": apply_same,
+        "repaint_ms": repaint,
+        "mutations": float(view.last_apply_mutations),
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# Navegación entre bocas (BocaCache)
+# ─────────────────────────────────────────────────────────────
+OTHER_DIENTES = "212,313,414,616V,1145,1146,1147,135,651,652"
+
+
+def bench_boca_switch(repeat: int = 50) -> Dict[str, float]:
+    """Ida y vuelta entre dos bocas: re-aplicar estados vs. snapshot en cache."""
+    _ensure_app()
+    from Modules.boca_cache import BocaCache
+    from Modules.modelos_sin_imagenes import OdontogramView
+    from Utils.sp_data_parse import parse_dientes_sp
+
+    bocas = {1: parse_dientes_sp(SAMPLE_DIENTES), 2: parse_dientes_sp(OTHER_DIENTES)}
+    view = OdontogramView(locked=True)
+    order = [1, 2]
+
+    def _apply() -> None:
+        order.reverse()
+        view.apply_batch_states(bocas[order[0]])
+
+    uncached = _timeit(_apply, repeat)
+
+    cache = BocaCache()
+    for idboca, states in bocas.items():
+        view.apply_batch_states(states)
+        cache.put(idboca, 0, view.freeze_model(), view.states, raw=states)
+
+    def _restore() -> None:
+        order.reverse()
+        snap = cache.get(order[0], 0)
+        assert snap is not None
+        view.restore(snap.model, snap.states)
+
+    cached = _timeit(_restore, repeat)
+    st = cache.stats()
+    return {
+        "apply_ms": uncached,
+        "cached_ms": cached,
+        "cache_kb": st["kb"],
+        "cache_hits": st["hits"],
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# Modelo (sin Qt): throughput de apply
+# ─────────────────────────────────────────────────────────────
+def bench_apply(repeat: int = 200, copies: int = 20) -> Dict[str, float]:
+    """`OdontogramState.apply_batch` sobre un lote grande (sin QApplication)."""
+    from Modules.odontogram_state import OdontogramState
+    from Utils.sp_data_parse import parse_dientes_sp
+
+    states = parse_dientes_sp(SAMPLE_DIENTES) * copies
+    ms = _timeit(lambda: OdontogramState().apply_batch(states), repeat)
+    base = _timeit(OdontogramState, repeat)          # costo de crear el modelo vacío
+    per_batch = max(ms - base, 1e-9)
+    return {
+        "states": float(len(states)),
+        "batch_ms": per_batch,
+        "states_per_s": len(states) / per_batch * 1000,
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# Lote de cambios (batch_update) y notificaciones de escena
+# ─────────────────────────────────────────────────────────────
+def bench_batch(repeat: int = 100, rounds: int = 5) -> Dict[str, float]:
+    """apply + repintado en el event loop, con y sin `batch_update`."""
+    app = _ensure_app()
+    from Modules.modelos_sin_imagenes import OdontogramView
+    from Utils.sp_data_parse import parse_dientes_sp
+
+    states = parse_dientes_sp(SAMPLE_DIENTES)
+    res: Dict[str, float] = {}
+    for tag, batching in (("plain", False), ("batch", True)):
+        view = OdontogramView(locked=True)
+        view.batching = batching
+        view.resize(900, 600)
+        view.show()
+        app.processEvents()
+        changes = view.count_scene_changes()
+        flip = [states, []]
+
+        def _cycle() -> None:
+            view.apply_batch_states(flip[0])
+            flip.reverse()
+            app.processEvents()
+
+        best = min(_timeit(_cycle, repeat) for _ in range(rounds))
+        n = repeat * rounds
+        res[f"{tag}_ms"] = best
+        res[f"{tag}_signals"] = changes["signals"] / n
+        res[f"{tag}_rects"] = changes["rects"] / n
+        view.close()
+    return res
+
+
+# ─────────────────────────────────────────────────────────────
+# Perfiles de render (Styles.render_profile)
+# ─────────────────────────────────────────────────────────────
+def bench_render(repeat: int = 100, rounds: int = 5) -> Dict[str, float]:
+    """Pintado del viewport por perfil: completo y tras cambiar una pieza."""
+    app = _ensure_app()
+    from Modules.modelos_sin_imagenes import OdontogramView
+    from Styles.render_profile import PROFILES
+    from Utils.sp_data_parse import parse_dientes_sp
+
+    states = parse_dientes_sp(SAMPLE_DIENTES)
+    one = states + [(1, 48, "O")]                     # una pieza más con obturación
+    res: Dict[str, float] = {}
+    for name in PROFILES:
+        view = OdontogramView(locked=True, render_profile=name)
+        view.resize(900, 600)
+        view.show()
+        view.apply_batch_states(states)
+        app.processEvents()
+        vp = view.viewport()
+        res[f"{name}_full_ms"] = min(_timeit(vp.repaint, repeat) for _ in range(rounds))
+
+        flip = [one, states]
+
+        def _partial() -> None:
+            view.apply_batch_states(flip[0])
+            flip.reverse()
+            app.processEvents()
+
+        res[f"{name}_partial_ms"] = min(_timeit(_partial, repeat) for _ in range(rounds))
+        view.close()
+    return res
+
+
+def _spin(app, ms: int) -> None:
+    """Corre el event loop `ms` milisegundos (timers y animaciones incluidos)."""
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        app.processEvents()
+        time.sleep(0.005)
+
+
+def bench_lowbw(repeat: int = 20) -> Dict[str, float]:
+    """
+    Píxeles repintados (Styles.low_bandwidth.RepaintMeter) por operación,
+    en modo normal y en modo bajo ancho de banda:
+    · view   – cambiar dos piezas alejadas (perfil "tuned" vs. "lowbw")
+    · header – actualizar los valores del header (sombra por efecto vs. pixmap,
+               degradado vs. fondo plano)
+    · hover  – entrar y salir del botón de descarga (animación vs. ícono fijo)
+    """
+    app = _ensure_app()
+    from PyQt5.QtCore import QEvent, QSize
+    from PyQt5.QtGui import QColor, QFont, QIcon, QPixmap
+    from PyQt5.QtWidgets import (QFrame, QGraphicsDropShadowEffect, QGridLayout,
+                                 QLabel, QToolButton)
+    from Modules.modelos_sin_imagenes import OdontogramView
+    from Styles import low_bandwidth, style
+    from Styles.animation import apply_button_colorize_animation
+    from Utils.sp_data_parse import parse_dientes_sp
+
+    states = parse_dientes_sp(SAMPLE_DIENTES)
+    two = states + [(1, 48, "O"), (1, 28, "O")]       # dos piezas en extremos opuestos
+    res: Dict[str, float] = {}
+    for mode, low in (("normal", False), ("lowbw", True)):
+        # —— odontograma ——
+        view = OdontogramView(locked=True, render_profile="lowbw" if low else "tuned")
+        view.resize(900, 600)
+        view.show()
+        view.apply_batch_states(states)
+        app.processEvents()
+        meter = low_bandwidth.RepaintMeter(view.viewport())
+        for i in range(repeat):
+            view.apply_batch_states(two if i % 2 == 0 else states)
+            app.processEvents()
+        res[f"{mode}_view_px"] = meter.pixels / repeat
+        view.close()
+
+        # —— header ——
+        style.apply_style(app, scale=1.0, low_bandwidth_mode=low)
+        hdr = QFrame()
+        hdr.setObjectName("headerFrame")
+        grid = QGridLayout(hdr)
+        values = []
+        for r, key in enumerate(("CREDENCIAL:", "AFILIADO:", "PRESTADOR:", "FECHA:")):
+            lbl = QLabel(key)
+            lbl.setFont(QFont("Segoe UI", 12, QFont.Bold))
+            lbl.setStyleSheet("color:white;")
+            if not low:
+                eff = QGraphicsDropShadowEffect()
+                eff.setBlurRadius(6)
+                eff.setOffset(0, 0)
+                eff.setColor(QColor(0, 0, 0, 180))
+                lbl.setGraphicsEffect(eff)
+            val = QLabel()
+            val.setStyleSheet("color:black; font-weight:bold; background:transparent;")
+            grid.addWidget(lbl, r, 0)
+            grid.addWidget(val, r, 1)
+            values.append(val)
+        if low:
+            for lbl in hdr.findChildren(QLabel):
+                if lbl not in values:
+                    lbl.ensurePolished()
+                    lbl.setPixmap(low_bandwidth.shadow_text_pixmap(
+                        lbl.text(), lbl.font(), lbl.palette().color(lbl.foregroundRole())))
+        hdr.resize(900, 160)
+        hdr.show()
+        app.processEvents()
+        meter = low_bandwidth.RepaintMeter()
+        meter.watch(hdr, children=True)
+        for i in range(repeat):
+            for val in values:
+                val.setText(f"{val is values[0] and 'ABC' or 'XYZ'}-{i:04d}")
+            app.processEvents()
+        res[f"{mode}_header_px"] = meter.pixels / repeat
+        hdr.close()
+
+        # —— hover del botón ——
+        btn = QToolButton()
+        pix = QPixmap(35, 35)
+        pix.fill(QColor("#888888"))
+        btn.setIcon(QIcon(pix))
+        btn.setIconSize(QSize(35, 35))
+        if low:
+            low_bandwidth.apply_button_static_hover(btn)
+        else:
+            apply_button_colorize_animation(btn)
+        btn.show()
+        app.processEvents()
+        meter = low_bandwidth.RepaintMeter(btn)
+        for ev in (QEvent.Enter, QEvent.Leave):
+            app.sendEvent(btn, QEvent(ev))
+            _spin(app, 400)
+        res[f"{mode}_hover_px"] = float(meter.pixels)
+        btn.close()
+    app.setStyleSheet("")
+    return res
+
+
+def bench_hit(repeat: int = 2000) -> Dict[str, float]:
+    """
+    Resolución de un clic a (pieza, cara): `OdontogramView.hit_test`
+    (Modules.tooth_geometry) vs. `QGraphicsScene.items(punto)` de Qt.
+    """
+    _ensure_app()
+    import random
+    from PyQt5.QtCore import QPointF
+    from Modules.modelos_sin_imagenes import OdontogramView
+    from Utils.sp_data_parse import parse_dientes_sp
+
+    view = OdontogramView(locked=False)
+    view.apply_batch_states(parse_dientes_sp(SAMPLE_DIENTES))
+    scene = view.scene()
+    rect = scene.itemsBoundingRect() if scene else None
+    rnd = random.Random(0)
+    pts = [QPointF(rnd.uniform(rect.left(), rect.right()),
+                   rnd.uniform(rect.top(), rect.bottom())) for _ in range(repeat)] if rect else []
+    it = iter(pts * 2)
+
+    t_hit = _timeit(lambda: view.hit_test(next(it)), repeat)
+    it = iter(pts * 2)
+    t_qt = _timeit(lambda: scene.items(next(it)) if scene else None, repeat)
+    hits = sum(1 for p in pts if view.hit_test(p)[0] is not None)
+    return {
+        "hit_test_us": t_hit * 1000,
+        "qt_items_us": t_qt * 1000,
+        "hit_ratio": hits / max(1, len(pts)),
+    }
+
+
+def bench_idle(tasks: int = 20, steps: int = 10, step_ms: float = 2.0) -> Dict[str, float]:
+    """
+    `tasks` tareas de `steps` pasos de `step_ms` cada una: bloqueo máximo
+    del event loop corriéndolas de una vez vs. con Utils.idle_scheduler.
+    """
+    _ensure_app()
+    from Utils.idle_scheduler import IdleScheduler
+
+    def _busy() -> None:
+        end = time.perf_counter() + step_ms / 1000
+        while time.perf_counter() < end:
+            pass
+
+    def _task():
+        for _ in range(steps):
+            _busy()
+            yield
+
+    t0 = time.perf_counter()
+    for _ in range(tasks):
+        for _ in _task():
+            pass
+    sync_ms = (time.perf_counter() - t0) * 1000
+
+    sched = IdleScheduler(idle_ms=0)
+    handles = [sched.submit(_task(), priority=i % 3) for i in range(tasks)]
+    handles[-1].cancel()                          # una cancelada a mitad de cola
+    t0 = time.perf_counter()
+    sched.run_pending(timeout_ms=60_000)
+    wall = (time.perf_counter() - t0) * 1000
+    m = sched.metrics()
+    return {
+        "sync_block_ms": sync_ms,
+        "sched_max_tick_ms": m["max_tick_ms"],
+        "sched_wall_ms": wall,
+        "sched_ticks": m["ticks"],
+        "sched_done": m["done"],
+        "sched_over_budget": m["over_budget"],
+    }
+
+
+BENCHES: Dict[str, Callable[[], Dict[str, float]]] = {
+    "view": bench_view,
+    "boca": bench_boca_switch,
+    "apply": bench_apply,
+    "batch": bench_batch,
+    "render": bench_render,
+    "lowbw": bench_lowbw,
+    "hit": bench_hit,
+    "idle": bench_idle,
+}
+
+
+def main(argv: List[str] | None = None) -> int:
+    names = (argv if argv is not None else sys.argv[1:]) or list(BENCHES)
+    for name in names:
+        fn = BENCHES.get(name)
+        if fn is None:
+            print(f"[WARN] Benchmark desconocido: {name} (opciones: {', '.join(BENCHES)})")
+            continue
+        res = fn()
+        print(f"[{name}]")
+        for k, val in res.items():
+            print(f"  {k:<16} {val:10.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
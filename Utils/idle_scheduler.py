@@ -0,0 +1,391 @@
+# Utils/idle_scheduler.py
+# coding: utf-8
+"""
+Planificador cooperativo de trabajo en tiempo ocioso.
+
+Los pasos corren en el hilo GUI (QGraphicsScene no se comparte entre
+hilos): un QTimer(0) ejecuta *pasos* cortos de las tareas pendientes
+hasta agotar el presupuesto del tick (`budget_ms`) y devuelve el control
+al event loop.  Si hubo entrada del usuario (mouse / teclado) sobre los
+widgets registrados con `watch_input()` hace menos de `idle_ms`, el
+siguiente tick se posterga.
+
+Una tarea es un callable (un solo paso) o un generador: cada `yield`
+marca un punto donde se puede ceder.  Menor `priority` corre primero;
+a igual prioridad, en orden de llegada.
+
+El presupuesto sólo acota lo que corre en el hilo GUI.  Lo bloqueante
+(consultas a la BD) va al único hilo de E/S con `run_in_worker()`: la
+tarea hace `res = yield fut`, queda en espera sin ocupar ticks y se
+reanuda en el hilo GUI con el resultado (o la excepción) del Future.
+El hilo de E/S es daemon: al cerrar la app no se espera una consulta
+en curso.
+
+    sched = idle_scheduler()
+    h = sched.submit(gen_fn(), priority=PRIO_PREFETCH, key="prefetch")
+    h.cancel()                      # o sched.cancel("prefetch")
+    print(sched.report())
+
+Enviar otra tarea con la misma `key` cancela la anterior (p. ej. el
+prefetch de la boca vecina cuando el usuario ya cambió de fila).
+"""
+
+from __future__ import annotations
+
+import heapq
+import inspect
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Generator, Hashable, List, Set, Tuple, Union
+
+from PyQt5.QtCore import QEvent, QObject, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QAbstractScrollArea, QApplication, QWidget
+
+# Prioridades (menor = antes)
+PRIO_HIGH, PRIO_PREFETCH, PRIO_WARM, PRIO_LOW = 0, 10, 20, 30
+
+Task = Union[Callable[[], object], Generator[object, None, object]]
+
+_INPUT_EVENTS = frozenset({
+    QEvent.MouseButtonPress, QEvent.MouseButtonRelease, QEvent.MouseButtonDblClick,
+    QEvent.MouseMove, QEvent.KeyPress, QEvent.KeyRelease, QEvent.Wheel,
+})
+
+
+class TaskHandle:
+    """Tarea encolada: permite cancelarla y consultar su estado."""
+
+    __slots__ = ("name", "key", "priority", "seq", "_task", "_future",
+                 "cancelled", "done", "failed", "steps", "run_ms")
+
+    def __init__(self, task: Task, name: str, key: Hashable | None,
+                 priority: int, seq: int) -> None:
+        self._task = task
+        self._future: Future | None = None       # E/S en espera (ver run_in_worker)
+        self.name = name
+        self.key = key
+        self.priority = priority
+        self.seq = seq
+        self.cancelled = False
+        self.done = False
+        self.failed = False
+        self.steps = 0
+        self.run_ms = 0.0
+
+    @property
+    def pending(self) -> bool:
+        return not (self.done or self.cancelled or self.failed)
+
+    def cancel(self) -> None:
+        if self.pending:
+            self.cancelled = True
+            close = getattr(self._task, "close", None)
+            if close is not None:
+                close()                            # libera el generador
+
+    @property
+    def waiting(self) -> bool:
+        """True si está esperando un Future del hilo de E/S."""
+        return self._future is not None
+
+    def step(self) -> bool:
+        """
+        Corre un paso; devuelve True si la tarea terminó.  Si el paso cedió
+        un Future queda en `waiting` hasta que el planificador la reanude.
+        """
+        task = self._task
+        if callable(task):
+            task()
+            return True
+        fut, self._future = self._future, None
+        try:
+            if fut is None:
+                out = next(task)
+            elif fut.exception() is not None:
+                out = task.throw(fut.exception())
+            else:
+                out = task.send(fut.result())
+        except StopIteration:
+            return True
+        if isinstance(out, Future):
+            self._future = out
+        return False
+
+    def __lt__(self, other: "TaskHandle") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+    def __repr__(self) -> str:
+        state = ("done" if self.done else "cancelled" if self.cancelled
+                 else "failed" if self.failed else "pending")
+        return f"<TaskHandle {self.name} p={self.priority} {state} steps={self.steps}>"
+
+
+class _IoWorker:
+    """
+    Un hilo daemon con su cola de trabajos.  No se usa ThreadPoolExecutor:
+    sus hilos se esperan al salir del intérprete (aun con
+    `shutdown(wait=False)`) y una consulta lenta demoraría el cierre.
+    """
+
+    def __init__(self) -> None:
+        self._queue: "queue.SimpleQueue[Tuple[Future, Callable[..., Any], tuple] | None]" = \
+            queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="idle-io", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        fut: Future = Future()
+        self._queue.put((fut, fn, args))
+        return fut
+
+    def shutdown(self) -> None:
+        """Cancela lo encolado y detiene el hilo al terminar el trabajo actual."""
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                job[0].cancel()
+        self._queue.put(None)
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            fut, fn, args = job
+            if not fut.set_running_or_notify_cancel():
+                continue
+            try:
+                res = fn(*args)
+            except BaseException as e:
+                fut.set_exception(e)
+            else:
+                fut.set_result(res)
+
+
+class IdleScheduler(QObject):
+    """Cola de prioridades de tareas cooperativas sobre un QTimer(0)."""
+
+    BUDGET_MS = 8.0        # ≈ medio cuadro a 60 Hz por tick
+    IDLE_MS = 150          # sin entrada del usuario durante este tiempo
+
+    # Future resuelto en el hilo de E/S → reanudación en el hilo GUI
+    _resolved = pyqtSignal(object)
+
+    def __init__(self, budget_ms: float | None = None, idle_ms: int | None = None,
+                 parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self.budget_ms = self.BUDGET_MS if budget_ms is None else budget_ms
+        self.idle_ms = self.IDLE_MS if idle_ms is None else idle_ms
+        self._heap: List[TaskHandle] = []
+        self._waiting: Set[TaskHandle] = set()
+        self._by_key: Dict[Hashable, TaskHandle] = {}
+        self._worker: _IoWorker | None = None
+        self._seq = 0
+        self._last_input = 0.0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._tick)
+        self._stats: Dict[str, float] = {
+            "submitted": 0, "done": 0, "cancelled": 0, "failed": 0,
+            "ticks": 0, "steps": 0, "busy_ms": 0.0, "max_tick_ms": 0.0,
+            "over_budget": 0, "deferred": 0, "io_waits": 0,
+        }
+        self._resolved.connect(self._resume)
+
+    # ------------------------- API -------------------------
+    def submit(self, task: Task, *, priority: int = PRIO_LOW,
+               key: Hashable | None = None, name: str | None = None) -> TaskHandle:
+        """Encola `task`; con `key`, reemplaza a la tarea pendiente de esa clave."""
+        if key is not None:
+            self.cancel(key)
+        if inspect.isgeneratorfunction(task):
+            task = task()
+        self._seq += 1
+        h = TaskHandle(task, name or getattr(task, "__name__", "tarea"), key,
+                       priority, self._seq)
+        heapq.heappush(self._heap, h)
+        if key is not None:
+            self._by_key[key] = h
+        self._stats["submitted"] += 1
+        self._schedule()
+        return h
+
+    def run_in_worker(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """
+        Ejecuta `fn(*args)` en el hilo de E/S (uno solo, se crea al primer
+        uso).  `fn` no debe tocar widgets ni compartir la conexión a la BD
+        del hilo GUI (cada consulta de Modules.conexion_db abre la suya).
+        """
+        if self._worker is None:
+            self._worker = _IoWorker()
+        return self._worker.submit(fn, *args)
+
+    def watch_input(self, *widgets: QWidget) -> None:
+        """
+        Registra los widgets cuya entrada (mouse / teclado / rueda) posterga
+        el trabajo ocioso; en vistas con scroll se observa también el
+        viewport.  Sólo estos widgets pasan por el filtro (no toda la app).
+        """
+        for w in widgets:
+            w.installEventFilter(self)
+            if isinstance(w, QAbstractScrollArea):
+                w.viewport().installEventFilter(self)
+
+    def shutdown(self) -> None:
+        """
+        Cancela lo pendiente y detiene el hilo de E/S.  No espera la
+        consulta en curso: el hilo es daemon y su resultado se descarta.
+        """
+        self.clear()
+        if self._worker is not None:
+            self._worker.shutdown()
+            self._worker = None
+
+    def cancel(self, key: Hashable) -> bool:
+        """Cancela la tarea pendiente con `key`; True si había una."""
+        h = self._by_key.pop(key, None)
+        if h is None or not h.pending:
+            return False
+        h.cancel()
+        self._stats["cancelled"] += 1
+        return True
+
+    def clear(self) -> int:
+        """Cancela todo lo pendiente; devuelve cuántas tareas."""
+        n = 0
+        for h in [*self._heap, *self._waiting]:
+            if h.pending:
+                h.cancel()
+                n += 1
+        self._heap.clear()
+        self._waiting.clear()
+        self._by_key.clear()
+        self._stats["cancelled"] += n
+        self._timer.stop()
+        return n
+
+    def pending(self) -> int:
+        return (sum(1 for h in self._heap if h.pending)
+                + sum(1 for h in self._waiting if h.pending))
+
+    def run_pending(self, timeout_ms: float = 5000) -> bool:
+        """
+        Procesa eventos hasta vaciar la cola (o `timeout_ms`); para
+        benchmarks y cierres ordenados.  True si quedó vacía.
+        """
+        app = QApplication.instance()
+        end = time.perf_counter() + timeout_ms / 1000
+        while self.pending() and time.perf_counter() < end:
+            if app is not None:
+                app.processEvents()
+            time.sleep(0.001)
+        return not self.pending()
+
+    def metrics(self) -> Dict[str, float]:
+        """Métricas acumuladas (para logs y benchmarks)."""
+        return dict(self._stats, pending=self.pending())
+
+    def report(self) -> str:
+        s = self.metrics()
+        return (f"tareas {s['done']:.0f} ok · {s['cancelled']:.0f} canceladas · "
+                f"{s['failed']:.0f} fallidas · {s['pending']:.0f} pendientes · "
+                f"{s['ticks']:.0f} ticks / {s['steps']:.0f} pasos · "
+                f"{s['io_waits']:.0f} esperas de E/S · "
+                f"tick máx {s['max_tick_ms']:.1f} ms (presupuesto {self.budget_ms:.0f} ms, "
+                f"excedido {s['over_budget']:.0f})")
+
+    # ----------------------- interno -----------------------
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:  # type: ignore[override]
+        if event.type() in _INPUT_EVENTS:
+            self._last_input = time.perf_counter()
+        return False
+
+    def _idle_wait_ms(self) -> int:
+        """Milisegundos hasta cumplir `idle_ms` sin entrada del usuario."""
+        since = (time.perf_counter() - self._last_input) * 1000
+        return max(0, int(self.idle_ms - since))
+
+    def _park(self, h: TaskHandle) -> None:
+        """Saca `h` de la cola hasta que su Future se resuelva."""
+        self._waiting.add(h)
+        self._stats["io_waits"] += 1
+        h._future.add_done_callback(lambda _f, h=h: self._resolved.emit(h))  # type: ignore[union-attr]
+
+    def _resume(self, h: TaskHandle) -> None:
+        self._waiting.discard(h)
+        if h.pending:
+            heapq.heappush(self._heap, h)
+            self._schedule()
+        elif h.key is not None and self._by_key.get(h.key) is h:
+            del self._by_key[h.key]
+
+    def _schedule(self) -> None:
+        if not self._timer.isActive() and self._heap:
+            self._timer.start(self._idle_wait_ms())
+
+    def _tick(self) -> None:
+        wait = self._idle_wait_ms()
+        if wait:                                   # el usuario está interactuando
+            self._stats["deferred"] += 1
+            self._timer.start(wait)
+            return
+
+        st = self._stats
+        t0 = time.perf_counter()
+        budget = self.budget_ms / 1000
+        while self._heap and time.perf_counter() - t0 < budget:
+            h = self._heap[0]
+            if not h.pending:
+                heapq.heappop(self._heap)
+                continue
+            # no empezar un paso que (según su promedio) no entra en el presupuesto
+            s0 = time.perf_counter()
+            if h.steps and s0 > t0 and (s0 - t0) * 1000 + h.run_ms / h.steps > self.budget_ms:
+                break
+            try:
+                finished = h.step()
+            except Exception as e:
+                print(f"[WARN] Tarea ociosa '{h.name}' falló: {e}")
+                h.failed = True
+                st["failed"] += 1
+                finished = False
+            h.steps += 1
+            h.run_ms += (time.perf_counter() - s0) * 1000
+            st["steps"] += 1
+            if finished:
+                h.done = True
+                st["done"] += 1
+            elif h.waiting and h.pending:
+                # fuera de la cola mientras espera la E/S (el paso pudo encolar otras)
+                self._heap.remove(h)
+                heapq.heapify(self._heap)
+                self._park(h)
+                continue
+            # se quita de la cola al llegar al tope (un paso puede encolar otras)
+            if not h.pending and h.key is not None and self._by_key.get(h.key) is h:
+                del self._by_key[h.key]
+
+        elapsed = (time.perf_counter() - t0) * 1000
+        st["ticks"] += 1
+        st["busy_ms"] += elapsed
+        st["max_tick_ms"] = max(st["max_tick_ms"], elapsed)
+        if elapsed > self.budget_ms:
+            st["over_budget"] += 1
+        self._schedule()
+
+
+_SCHEDULER: IdleScheduler | None = None
+
+
+def idle_scheduler() -> IdleScheduler:
+    """Planificador compartido de la aplicación (se crea al primer uso)."""
+    global _SCHEDULER
+    if _SCHEDULER is None:
+        _SCHEDULER = IdleScheduler()
+    return _SCHEDULER
+
@@ -11,6 +11,7 @@ from PyQt5.QtGui     import QMovie
 from PyQt5.QtWidgets import QApplication, QLabel, QVBoxLayout, QWidget
 
 from Modules.utils import resource_path
+from Styles import low_bandwidth
 
 
 class LoadingSplash(QWidget):
@@ -23,7 +24,9 @@ class LoadingSplash(QWidget):
         gif_rel_path: str,
         message: str | None = None,
         max_gif_size: QSize | None = QSize(160, 160),
+        animated: bool | None = None,
     ) -> None:
+        """`animated=None` → animado salvo en modo bajo ancho de banda."""
 
         super().__init__(None)  # ← solo parent (None)
 
@@ -60,7 +63,12 @@ class LoadingSplash(QWidget):
             lbl_txt.setStyleSheet("color:white; font-size:14pt;")
             box.addWidget(lbl_txt)
 
-        self._movie.start()                              # ¡animación en marcha!
+        if animated is None:
+            animated = not low_bandwidth.enabled()
+        if animated:
+            self._movie.start()                          # ¡animación en marcha!
+        else:
+            self._movie.jumpToFrame(0)                   # sólo el primer cuadro
 
         # ► Centrar splash
         self.adjustSize()
@@ -14,39 +14,177 @@ Ejemplos
     "155"      → estado 1,  diente 55, caras ""
     "117OV"    → estado 1,  diente 17, caras "OV"
     "1418M"    → estado 14, diente 18, caras "M"
+
+La inversa es `encode_dientes`: lista de estados → string canónico
+(ordenado por diente/estado, sin duplicados, caras en orden FACE_ORDER),
+de modo que  parse_dientes_sp(encode_dientes(x)) == canonical_states(x).
+
+Diagnóstico
+-----------
+Los tokens mal formados no se loguean uno a uno: se acumulan en un
+`ParseDiagnostics` (contadores + primeros N ejemplos por tipo de error).
+Modos:
+    "strict"   → el primer error lanza `DientesParseError`.
+    "lenient"  → se descarta el token y se emite UN warning por boca.
+    "silent"   → se descarta el token sin loguear nada.
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
-import re
-from typing import List, Tuple
+import random
+import sys
+from typing import Dict, Iterable, List, Tuple, cast
 
 # --- dependencias centrales desde Modules.utils --------------------
-from Modules.utils import (
-    MAX_STATE,
-    ALL_TEETH,
-    VALID_FACE_CHARS,
+from Modules.tooth_index import FDI_NUMBERS, VALID_TEETH
+from Modules.utils import MAX_STATE, VALID_FACE_CHARS
+
+# --- gramática única (tabla {dígitos → (estado, diente)}) ----------
+from Utils.tooth_codes import (
+    DIALECT_SP,
+    ERR_CARAS,
+    classify,
+    split_token,
 )
 
-_NUM_FACE_RE = re.compile(r"^(\d{3,4})([A-Za-z]*)$")   # 3-4 dígitos + opcional letras
+# ─────────────────────────────────────────────────────────────
+# Modos y tipos de error
+# ─────────────────────────────────────────────────────────────
+MODE_STRICT  = "strict"
+MODE_LENIENT = "lenient"
+MODE_SILENT  = "silent"
+PARSE_MODES  = (MODE_STRICT, MODE_LENIENT, MODE_SILENT)
+
+# Los tipos de error (ERR_*) los define Utils.tooth_codes; con ERR_CARAS el
+# token se acepta descartando las letras desconocidas.
+
+DEFAULT_MAX_EXAMPLES = 3
+
+# Orden canónico de las letras de caras al serializar
+FACE_ORDER = "MDVBLPIO"
+_FACE_RANK = {c: i for i, c in enumerate(FACE_ORDER)}
+
+
+class DientesParseError(ValueError):
+    """Error de parseo en modo estricto; expone el diagnóstico parcial."""
+
+    def __init__(self, kind: str, token: str, diagnostics: "ParseDiagnostics") -> None:
+        super().__init__(f"{kind}: '{token}'")
+        self.kind = kind
+        self.token = token
+        self.diagnostics = diagnostics
+
+
+class ParseDiagnostics:
+    """Contadores y ejemplos de errores de un parseo (una boca)."""
+
+    __slots__ = ("tokens", "accepted", "counts", "examples", "max_examples")
+
+    def __init__(self, max_examples: int = DEFAULT_MAX_EXAMPLES) -> None:
+        self.tokens = 0
+        self.accepted = 0
+        self.counts: Dict[str, int] = {}
+        self.examples: Dict[str, List[str]] = {}
+        self.max_examples = max_examples
+
+    def record(self, kind: str, token: str) -> None:
+        """Cuenta un error y guarda el token si aún hay cupo de ejemplos."""
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        ex = self.examples.setdefault(kind, [])
+        if len(ex) < self.max_examples:
+            ex.append(token)
+
+    @property
+    def errors(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def ok(self) -> bool:
+        return not self.counts
+
+    def summary(self) -> str:
+        """Texto compacto: 'token_invalido=2 ['x', 'y']; …'."""
+        return "; ".join(
+            f"{kind}={n} {self.examples.get(kind, [])}"
+            for kind, n in sorted(self.counts.items())
+        )
+
+    def __repr__(self) -> str:
+        return (f"ParseDiagnostics(tokens={self.tokens}, accepted={self.accepted}, "
+                f"counts={self.counts})")
 
 
 # ─────────────────────────────────────────────────────────────
 # helpers internos
 # ─────────────────────────────────────────────────────────────
-def _sanitize_faces(faces: str) -> str:
-    """Devuelve sólo las letras válidas (M D V B L P I O, mayúsculas)."""
-    faces_up = faces.upper()
-    if any(c not in VALID_FACE_CHARS for c in faces_up):
-        logging.warning("Caras inválidas en '%s'; se descartan las desconocidas", faces)
-    return "".join(c for c in faces_up if c in VALID_FACE_CHARS)
+def _sanitize_faces(tok: str) -> Tuple[int, int, str]:
+    """Decodifica un token con caras desconocidas, conservando sólo las válidas."""
+    digits, faces = split_token(tok)
+    estado, diente, _ = cast(Tuple[int, int, str], classify(digits, DIALECT_SP))
+    return estado, diente, "".join(c for c in faces.upper() if c in VALID_FACE_CHARS)
+
+
+def _fail(kind: str, tok: str, diag: ParseDiagnostics, mode: str) -> None:
+    diag.record(kind, tok)
+    if mode == MODE_STRICT:
+        raise DientesParseError(kind, tok, diag)
 
 
 # ─────────────────────────────────────────────────────────────
 # API pública
 # ─────────────────────────────────────────────────────────────
-def parse_dientes_sp(raw: str | None) -> List[Tuple[int, int, str]]:
+def parse_dientes_sp_diag(
+    raw: str | None,
+    *,
+    mode: str = MODE_LENIENT,
+    max_examples: int = DEFAULT_MAX_EXAMPLES,
+    context: str | None = None,
+) -> Tuple[List[Tuple[int, int, str]], ParseDiagnostics]:
+    """
+    Igual que `parse_dientes_sp`, pero devuelve también el diagnóstico.
+
+    `context` (p. ej. "idBoca=123") sólo se usa en el warning resumido.
+    """
+    if mode not in PARSE_MODES:
+        raise ValueError(f"Modo de parseo desconocido: {mode!r}")
+
+    diag = ParseDiagnostics(max_examples)
+    result: List[Tuple[int, int, str]] = []
+    if not raw:
+        return result, diag
+
+    for tok in raw.split(","):
+        tok = tok.strip()
+        if not tok:
+            continue
+        diag.tokens += 1
+
+        res = classify(tok, DIALECT_SP)
+        if isinstance(res, str):
+            _fail(res, tok, diag, mode)
+            if res != ERR_CARAS:
+                continue
+            res = _sanitize_faces(tok)
+        result.append(res)
+        diag.accepted += 1
+
+    if mode == MODE_LENIENT and diag.counts:
+        logging.warning(
+            "Columna dientes%s: %d/%d tokens con errores → %s",
+            f" ({context})" if context else "",
+            diag.errors, diag.tokens, diag.summary(),
+        )
+    return result, diag
+
+
+def parse_dientes_sp(
+    raw: str | None,
+    *,
+    mode: str = MODE_LENIENT,
+    context: str | None = None,
+) -> List[Tuple[int, int, str]]:
     """
     Convierte un string del SP en lista de tuplas:
         [(estado_int, diente_int, caras_str), …]
@@ -55,38 +193,72 @@ def parse_dientes_sp(raw: str | None) -> List[Tuple[int, int, str]]:
     • estado en 1-19
     • diente ∈ ALL_TEETH
     """
-    if not raw:
-        return []
+    return parse_dientes_sp_diag(raw, mode=mode, context=context)[0]
 
-    tokens = (tok.strip() for tok in raw.split(","))
-    result: List[Tuple[int, int, str]] = []
 
-    for tok in tokens:
-        if not tok:
-            continue
+# ─────────────────────────────────────────────────────────────
+# Serialización canónica (inversa del parser)
+# ─────────────────────────────────────────────────────────────
+def _canonical_faces(faces: str) -> str:
+    """Mayúsculas, sin repetidas, sin desconocidas y en orden FACE_ORDER."""
+    return "".join(sorted({c for c in faces.upper() if c in _FACE_RANK},
+                          key=_FACE_RANK.__getitem__))
 
-        m = _NUM_FACE_RE.fullmatch(tok)
-        if not m:
-            logging.warning("Token inválido en columna dientes: '%s'", tok)
-            continue
 
-        num_part, face_part = m.groups()
+def canonical_states(states: Iterable[Tuple[int, int, str]]) -> List[Tuple[int, int, str]]:
+    """
+    Normaliza una lista de estados: caras canónicas, sin duplicados y
+    ordenada por (diente, estado, caras).  Descarta estados/dientes inválidos.
+    """
+    uniq = {
+        (int(e), int(d), _canonical_faces(c))
+        for e, d, c in states
+        if 1 <= int(e) <= MAX_STATE and int(d) in VALID_TEETH
+    }
+    return sorted(uniq, key=lambda t: (t[1], t[0], t[2]))
 
-        # — diente: últimos 2 dígitos —
-        diente = int(num_part[-2:])
 
-        # — estado: el resto (1 o 2 dígitos) —
-        estado = int(num_part[:-2])
+def encode_dientes(states: Iterable[Tuple[int, int, str]]) -> str:
+    """Lista [(estado, diente, caras), …] → string canónico de la columna dientes."""
+    return ",".join(f"{e}{d:02d}{c}" for e, d, c in canonical_states(states))
 
-        # validaciones
-        if not (1 <= estado <= MAX_STATE):
-            logging.warning("Estado fuera de rango (1-%d) en '%s'", MAX_STATE, tok)
-            continue
-        if diente not in ALL_TEETH:
-            logging.warning("Diente %s no reconocido en '%s'", diente, tok)
-            continue
 
-        caras = _sanitize_faces(face_part)
-        result.append((estado, diente, caras))
+def dientes_key(states: Iterable[Tuple[int, int, str]]) -> str:
+    """Hash corto y estable del odontograma (para caches / deduplicación)."""
+    return hashlib.blake2b(encode_dientes(states).encode("ascii"), digest_size=12).hexdigest()
+
+
+def check_roundtrip(raws: Iterable[str]) -> List[str]:
+    """
+    Verifica, para cada string, que parsear → serializar → parsear sea
+    estable y coincida con `canonical_states`.  Devuelve los que fallan.
+    """
+    fails: List[str] = []
+    for raw in raws:
+        parsed = parse_dientes_sp(raw, mode=MODE_SILENT)
+        enc = encode_dientes(parsed)
+        back = parse_dientes_sp(enc, mode=MODE_STRICT)
+        if back != canonical_states(parsed) or encode_dientes(back) != enc:
+            fails.append(raw)
+    return fails
+
+
+def _random_corpus(n: int, seed: int = 0) -> Iterable[str]:
+    rnd = random.Random(seed)
+    teeth = FDI_NUMBERS
+    for _ in range(n):
+        yield ",".join(
+            f"{rnd.randint(0, MAX_STATE + 1)}{rnd.choice(teeth)}"
+            f"{''.join(rnd.choices('MDVBLPIOmdvx', k=rnd.randint(0, 3)))}"
+            for _ in range(rnd.randint(0, 30))
+        )
+
 
-    return result
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    bad = check_roundtrip(_random_corpus(total))
+    for raw in bad[:10]:
+        print("[FAIL]", raw)
+    print(f"[{'OK' if not bad else 'ERROR'}] round-trip de {total} odontogramas, "
+          f"{len(bad)} fallos")
+    sys.exit(1 if bad else 0)
@@ -0,0 +1,247 @@
+#Utils/sp_stream.py
+# coding: utf-8
+"""
+Parseo masivo (streaming) de exportaciones de la columna `dientes`.
+
+Pensado para CSV exportados desde SQL Server con decenas de millones de
+filas: se lee línea a línea (memoria constante), se parsea por bloques y,
+opcionalmente, los bloques se reparten en un pool de procesos.
+
+Uso desde consola
+-----------------
+    python -m Utils.sp_stream export.csv -o dientes.tsv --workers 4 --key idboca
+
+Salida compacta (TSV, una fila por registro):
+    <clave>\t<errores>\t<estado>:<diente>:<caras> <estado>:<diente>:<caras> …
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import IO, Deque, Iterable, Iterator, List, NamedTuple, Tuple
+
+from Utils.sp_data_parse import MODE_SILENT, parse_dientes_sp_diag
+
+DEFAULT_CHUNK_SIZE = 5_000
+DEFAULT_COLUMN = "dientes"
+MAX_SKIP_WARNINGS = 10    # avisos individuales de filas omitidas
+
+State = Tuple[int, int, str]
+
+
+class Record(NamedTuple):
+    """Resultado de una fila: clave (o nº de fila), estados y nº de errores."""
+    key: str
+    states: List[State]
+    errors: int
+
+
+class StreamStats:
+    """Contadores acumulados de una corrida."""
+
+    __slots__ = ("rows", "states", "errors", "started", "elapsed")
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self.states = 0
+        self.errors = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def add(self, chunk: List[Record]) -> None:
+        self.rows += len(chunk)
+        for rec in chunk:
+            self.states += len(rec.states)
+            self.errors += rec.errors
+        self.elapsed = time.perf_counter() - self.started
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.rows} filas · {self.states} estados · {self.errors} errores · "
+                f"{self.elapsed:.1f}s · {self.rows_per_sec:,.0f} filas/s")
+
+
+# ─────────────────────────────────────────────────────────────
+# Lectura
+# ─────────────────────────────────────────────────────────────
+def iter_rows(
+    source: IO[str],
+    *,
+    column: str = DEFAULT_COLUMN,
+    key_column: str | None = None,
+    delimiter: str = ",",
+) -> Iterator[Tuple[str, str]]:
+    """
+    Recorre un CSV con encabezado y produce (clave, dientes) por fila.
+    Sin `key_column` (o si la fila no llega a esa celda) la clave es el
+    número de fila de datos (1-based).  Las filas sin celda `dientes`
+    (cortas o irregulares) se omiten y se informan; las líneas vacías se
+    omiten sin aviso.
+    """
+    reader = csv.reader(source, delimiter=delimiter)
+    header = [h.strip().lower() for h in next(reader, [])]
+    try:
+        col_idx = header.index(column.lower())
+        key_idx = header.index(key_column.lower()) if key_column else -1
+    except ValueError as e:
+        raise ValueError(f"Columna no encontrada en el encabezado {header}: {e}") from None
+
+    skipped = 0
+    for n, row in enumerate(reader, 1):
+        if len(row) <= col_idx:
+            if row:
+                skipped += 1
+                if skipped <= MAX_SKIP_WARNINGS:
+                    logging.warning("Fila %d sin columna '%s' (%d celdas): se omite",
+                                    n, column, len(row))
+            continue
+        key = row[key_idx] if 0 <= key_idx < len(row) else str(n)
+        yield (key, row[col_idx])
+    if skipped > MAX_SKIP_WARNINGS:
+        logging.warning("%d filas sin columna '%s' omitidas en total", skipped, column)
+
+
+def _chunks(rows: Iterable[Tuple[str, str]], size: int) -> Iterator[List[Tuple[str, str]]]:
+    buf: List[Tuple[str, str]] = []
+    for r in rows:
+        buf.append(r)
+        if len(buf) >= size:
+            yield buf
+            buf = []
+    if buf:
+        yield buf
+
+
+def _parse_chunk(rows: List[Tuple[str, str]]) -> List[Record]:
+    """Trabajo de un bloque (se ejecuta en el proceso hijo)."""
+    out: List[Record] = []
+    for key, raw in rows:
+        states, diag = parse_dientes_sp_diag(raw, mode=MODE_SILENT, max_examples=0)
+        out.append(Record(key, states, diag.errors))
+    return out
+
+
+# ─────────────────────────────────────────────────────────────
+# API pública
+# ─────────────────────────────────────────────────────────────
+def parse_stream(
+    source: IO[str],
+    *,
+    column: str = DEFAULT_COLUMN,
+    key_column: str | None = None,
+    delimiter: str = ",",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 0,
+    stats: StreamStats | None = None,
+) -> Iterator[List[Record]]:
+    """
+    Parsea `source` y produce bloques de `Record` en el orden de entrada.
+
+    • workers = 0 → todo en el proceso actual.
+    • workers > 0 → pool de procesos; como máximo 2×workers bloques en
+      vuelo, así la memoria no crece con el tamaño del archivo.
+    """
+    chunks = _chunks(
+        iter_rows(source, column=column, key_column=key_column, delimiter=delimiter),
+        chunk_size,
+    )
+
+    if workers <= 0:
+        for ch in chunks:
+            parsed = _parse_chunk(ch)
+            if stats is not None:
+                stats.add(parsed)
+            yield parsed
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Future] = deque()
+        for ch in chunks:
+            pending.append(pool.submit(_parse_chunk, ch))
+            if len(pending) >= 2 * workers:
+                parsed = pending.popleft().result()
+                if stats is not None:
+                    stats.add(parsed)
+                yield parsed
+        while pending:
+            parsed = pending.popleft().result()
+            if stats is not None:
+                stats.add(parsed)
+            yield parsed
+
+
+def iter_records(source: IO[str], **kwargs) -> Iterator[Record]:
+    """Versión “plana” de `parse_stream`: un `Record` por vez."""
+    for chunk in parse_stream(source, **kwargs):
+        yield from chunk
+
+
+def format_record(rec: Record) -> str:
+    """Línea TSV compacta de un registro (sin salto de línea)."""
+    body = " ".join(f"{e}:{d}:{c}" for e, d, c in rec.states)
+    return f"{rec.key}\t{rec.errors}\t{body}"
+
+
+def write_compact(chunks: Iterable[List[Record]], out: IO[str]) -> None:
+    """Escribe los bloques en `out`, un `write` por bloque."""
+    for chunk in chunks:
+        out.write("\n".join(format_record(r) for r in chunk))
+        out.write("\n")
+
+
+# ─────────────────────────────────────────────────────────────
+# CLI
+# ─────────────────────────────────────────────────────────────
+def main(argv: List[str] | None = None) -> int:
+    p = argparse.ArgumentParser("python -m Utils.sp_stream",
+                                description="Parseo masivo de la columna dientes")
+    p.add_argument("input", help="CSV de entrada ('-' = stdin)")
+    p.add_argument("-o", "--output", help="TSV de salida (por defecto stdout)")
+    p.add_argument("--column", default=DEFAULT_COLUMN)
+    p.add_argument("--key", dest="key_column")
+    p.add_argument("--delimiter", default=",")
+    p.add_argument("--chunk", type=int, default=DEFAULT_CHUNK_SIZE)
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--encoding", default="utf-8-sig")
+    args = p.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    src = (io.TextIOWrapper(sys.stdin.buffer, encoding=args.encoding, newline="")
+           if args.input == "-" else open(args.input, encoding=args.encoding, newline=""))
+    dst = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+
+    stats = StreamStats()
+    try:
+        for chunk in parse_stream(
+            src,
+            column=args.column,
+            key_column=args.key_column,
+            delimiter=args.delimiter,
+            chunk_size=args.chunk,
+            workers=args.workers,
+            stats=stats,
+        ):
+            write_compact((chunk,), dst)
+            logging.info("[INFO] %s", stats)
+    finally:
+        src.close()
+        if dst is not sys.stdout:
+            dst.close()
+
+    logging.info("[OK] %s", stats)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
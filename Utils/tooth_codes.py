@@ -0,0 +1,171 @@
+#Utils/tooth_codes.py
+# coding: utf-8
+"""
+Gramática única para los códigos de pieza `{ESTADO}{DIENTE}{CARAS}`.
+
+Conviven dos dialectos:
+• SP  – columna `dientes` de los SP (estados 1-MAX_STATE).
+• CLI – parámetro `--dientes` del README / Versions/dental_v05
+        (estados históricos 1-13).
+
+En ambos el token es: corrida de dígitos + letras de caras.  La corrida
+completa se busca en una tabla precalculada {dígitos → (estado, diente)}
+construida con el índice FDI (`Modules.tooth_index`) y el rango de estados del dialecto, así que
+no hay backtracking: un token se resuelve con un split y un lookup.
+
+    "1155"   → (11, 55, "")        "135OLP" → (1, 35, "OLP")
+    "1418M"  → SP (14, 18, "M")  ·  CLI inválido (estado 14 > 13)
+
+`python -m Utils.tooth_codes` corre el corpus de conformidad.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Dict, FrozenSet, List, Tuple
+
+from Modules.tooth_index import FDI_NUMBERS
+from Modules.utils import MAX_STATE, VALID_FACE_CHARS
+
+# ─────────────────────────────────────────────────────────────
+# Dialectos y tipos de error
+# ─────────────────────────────────────────────────────────────
+DIALECT_SP  = "sp"
+DIALECT_CLI = "cli"
+
+_STATE_RANGES: Dict[str, range] = {
+    DIALECT_SP:  range(1, MAX_STATE + 1),
+    DIALECT_CLI: range(1, 14),
+}
+
+ERR_TOKEN  = "token_invalido"          # no respeta dígitos + letras
+ERR_ESTADO = "estado_fuera_de_rango"   # estado fuera del rango del dialecto
+ERR_DIENTE = "diente_desconocido"      # diente ∉ ALL_TEETH
+ERR_CARAS  = "caras_invalidas"         # letras que no son caras
+
+_DIGITS = "0123456789"
+_FACES: FrozenSet[str] = frozenset(VALID_FACE_CHARS)
+
+
+def _build_table(states: range) -> Dict[str, Tuple[int, int]]:
+    table: Dict[str, Tuple[int, int]] = {}
+    for st in states:
+        for d in FDI_NUMBERS:
+            table[f"{st}{d:02d}"] = (st, d)
+            table[f"{st:02d}{d:02d}"] = (st, d)      # "0326" ≡ "326"
+    return table
+
+
+# {dialecto: {"1155": (11, 55), …}} – ~2 000 entradas por dialecto
+CODE_TABLES: Dict[str, Dict[str, Tuple[int, int]]] = {
+    name: _build_table(rng) for name, rng in _STATE_RANGES.items()
+}
+
+
+# ─────────────────────────────────────────────────────────────
+# API pública
+# ─────────────────────────────────────────────────────────────
+def split_token(tok: str) -> Tuple[str, str]:
+    """Separa la corrida inicial de dígitos del resto: '117OV' → ('117', 'OV')."""
+    rest = tok.lstrip(_DIGITS)
+    return tok[: len(tok) - len(rest)], rest
+
+
+def classify(tok: str, dialect: str = DIALECT_SP) -> Tuple[int, int, str] | str:
+    """
+    Decodifica `tok` (ya sin espacios).
+
+    Devuelve (estado, diente, CARAS) o, si el token no es válido, el tipo
+    de error (`ERR_*`).  Las caras se devuelven en mayúsculas tal cual; si
+    hay letras que no son caras el resultado es `ERR_CARAS`.
+    """
+    digits, rest = split_token(tok)
+    hit = CODE_TABLES[dialect].get(digits)
+    if hit is None:
+        return _diagnose(digits, rest, dialect)
+    if not rest:
+        return hit[0], hit[1], ""
+    if not (rest.isascii() and rest.isalpha()):
+        return ERR_TOKEN
+    faces = rest.upper()
+    if not _FACES.issuperset(faces):
+        return ERR_CARAS
+    return hit[0], hit[1], faces
+
+
+def decode_token(tok: str, dialect: str = DIALECT_SP) -> Tuple[int, int, str] | None:
+    """Como `classify`, pero devuelve None ante cualquier error."""
+    res = classify(tok, dialect)
+    return None if isinstance(res, str) else res
+
+
+def _diagnose(digits: str, rest: str, dialect: str) -> str:
+    """Sólo se llama en el camino de error (token no está en la tabla)."""
+    if not 3 <= len(digits) <= 4 or (rest and not (rest.isascii() and rest.isalpha())):
+        return ERR_TOKEN
+    if int(digits[:-2]) not in _STATE_RANGES[dialect]:
+        return ERR_ESTADO
+    return ERR_DIENTE
+
+
+# ─────────────────────────────────────────────────────────────
+# Corpus de conformidad
+# ─────────────────────────────────────────────────────────────
+# (token, resultado SP, resultado CLI); un str indica el error esperado.
+CONFORMANCE_CORPUS: List[Tuple[str, object, object]] = [
+    # — ejemplos del README (--dientes) —
+    ("111",    (1, 11, ""),      (1, 11, "")),
+    ("212V",   (2, 12, "V"),     (2, 12, "V")),
+    ("414MD",  (4, 14, "MD"),    (4, 14, "MD")),
+    ("616VI",  (6, 16, "VI"),    (6, 16, "VI")),
+    ("1085",   (10, 85, ""),     (10, 85, "")),
+    ("1147",   (11, 47, ""),     (11, 47, "")),
+    ("1342",   (13, 42, ""),     (13, 42, "")),
+    ("135OLP", (1, 35, "OLP"),   (1, 35, "OLP")),
+    ("653",    (6, 53, ""),      (6, 53, "")),
+    # — ejemplos del SP —
+    ("1155",   (11, 55, ""),     (11, 55, "")),
+    ("155",    (1, 55, ""),      (1, 55, "")),
+    ("117OV",  (1, 17, "OV"),    (1, 17, "OV")),
+    ("117ov",  (1, 17, "OV"),    (1, 17, "OV")),
+    ("1418M",  (14, 18, "M"),    ERR_ESTADO),
+    ("1875",   (18, 75, ""),     ERR_ESTADO),
+    ("0326",   (3, 26, ""),      (3, 26, "")),
+    # — dientes fuera de ALL_TEETH (el backtracking aceptaba 11-85) —
+    ("119",    ERR_DIENTE,       ERR_DIENTE),
+    ("130",    ERR_DIENTE,       ERR_DIENTE),
+    ("1019",   ERR_DIENTE,       ERR_DIENTE),
+    ("586",    ERR_DIENTE,       ERR_DIENTE),
+    # — estados fuera de rango —
+    ("011",    ERR_ESTADO,       ERR_ESTADO),
+    ("2011",   ERR_ESTADO,       ERR_ESTADO),
+    # — forma inválida —
+    ("",       ERR_TOKEN,        ERR_TOKEN),
+    ("11",     ERR_TOKEN,        ERR_TOKEN),
+    ("11111",  ERR_TOKEN,        ERR_TOKEN),
+    ("V111",   ERR_TOKEN,        ERR_TOKEN),
+    ("11V1",   ERR_TOKEN,        ERR_TOKEN),
+    ("111-V",  ERR_TOKEN,        ERR_TOKEN),
+    ("111Ñ",   ERR_TOKEN,        ERR_TOKEN),
+    ("111X",   ERR_CARAS,        ERR_CARAS),
+]
+
+
+def check_conformance() -> List[str]:
+    """Corre el corpus en ambos dialectos; devuelve la lista de fallos."""
+    fails: List[str] = []
+    for tok, exp_sp, exp_cli in CONFORMANCE_CORPUS:
+        for dialect, exp in ((DIALECT_SP, exp_sp), (DIALECT_CLI, exp_cli)):
+            got = classify(tok, dialect)
+            if got != exp:
+                fails.append(f"[{dialect}] {tok!r}: esperado {exp!r}, obtenido {got!r}")
+    return fails
+
+
+if __name__ == "__main__":
+    errs = check_conformance()
+    for e in errs:
+        print("[FAIL]", e)
+    print(f"[{'OK' if not errs else 'ERROR'}] {len(CONFORMANCE_CORPUS)} tokens × 2 dialectos, "
+          f"{len(errs)} fallos")
+    sys.exit(1 if errs else 0)
@@ -23,6 +23,7 @@ except ImportError:
 from Modules.conexion_db import get_bocas_consulta_efector
 from Modules.views       import MainWindow
 from Utils.loading_img   import LoadingSplash
+from Utils.idle_scheduler import idle_scheduler
 
 # ─── Instancia única ────────────────────────────────────────
 APP_ID = "OdontogramaSingletonKey"
@@ -59,6 +60,7 @@ def main() -> None:
 
     # 2) Qt App + splash inmediato ---------------------------
     app = QApplication(sys.argv)
+    idle_scheduler()                                # trabajo en tiempo ocioso (prefetch, …)
     apply_style(app)                                # <-- si el CSS es válido
     splash = LoadingSplash(
         app,
@@ -83,7 +85,9 @@ def main() -> None:
 
     # 5) Cerrar splash y entrar al loop ----------------------
     splash.finish(win)
-    sys.exit(app.exec_())
+    code = app.exec_()
+    idle_scheduler().shutdown()                     # no esperar prefetch en curso
+    sys.exit(code)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,46 @@
+# test_filters.py
+# coding: utf-8
+"""
+Motor de filtros compilados (Modules.filters), sin Qt.
+
+    python -m pytest -q test_filters.py
+"""
+import pytest
+
+from Modules.filters import (
+    ALL_FACES, MODE_EXISTENTES, MODE_REQUERIDAS, MODE_TODOS,
+    compile_filter, faces_mask, pack, precompute_modes, run,
+)
+from Modules.odontogram_state import FACE_INDEX
+from Modules.tooth_index import ARCH_UPPER
+from Modules.utils import REQUERIDAS_MASK
+
+STATES = [(1, 14, "MD"), (13, 21, ""), (1, 36, "O"), (14, 46, ""), (1, 11, "X")]
+
+
+def test_faces_mask():
+    assert faces_mask("") == ALL_FACES
+    assert faces_mask("md") == (1 << FACE_INDEX["left"]) | (1 << FACE_INDEX["right"])
+    assert faces_mask("X") == 0
+    assert faces_mask("XO") == 1 << FACE_INDEX["center"]
+
+
+def test_faces_without_valid_letters_is_an_error():
+    with pytest.raises(ValueError):
+        compile_filter(faces="X")
+
+
+def test_face_and_arch_filters():
+    arr = pack(STATES)
+    # sin caras = pieza entera
+    assert run(compile_filter(faces="M"), arr) == [(1, 14, "MD"), (13, 21, ""), (14, 46, "")]
+    assert run(compile_filter(arch=ARCH_UPPER), arr) == [
+        (1, 14, "MD"), (13, 21, ""), (1, 11, "X")]
+
+
+def test_modes_match_compiled_filters():
+    arr = pack(STATES)
+    modes = precompute_modes(arr)
+    for m in (MODE_TODOS, MODE_EXISTENTES, MODE_REQUERIDAS):
+        assert modes[m] == run(compile_filter(mode=m), arr), m
+    assert all(REQUERIDAS_MASK >> c & 1 for c, _, _ in modes[MODE_REQUERIDAS])
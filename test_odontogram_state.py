@@ -0,0 +1,98 @@
+# test_odontogram_state.py
+# coding: utf-8
+"""
+Despacho de estados del modelo sin Qt (Modules.odontogram_state).
+
+    python -m pytest -q test_odontogram_state.py
+
+No crea QApplication: el modelo debe poder usarse sin display.
+"""
+import subprocess
+import sys
+
+from Modules.odontogram_state import (
+    FACE_INDEX, FILL_BLUE, FILL_GRAY, FILL_RED, FILL_WHITE,
+    LINES_EXT, LINES_NONE, LINES_PD, OV_AUSENTE, OV_CORONA,
+    OdontogramState, ToothState,
+)
+from Modules.utils import ESTADOS, Estado
+
+
+def _faces(ts: ToothState) -> dict:
+    return {name: ts.faces[i] for name, i in FACE_INDEX.items()}
+
+
+def test_import_without_qt():
+    code = ("import sys, Modules.odontogram_state, Modules.tooth_geometry; "
+            "sys.exit(any(m.startswith('PyQt5') for m in sys.modules))")
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+
+def test_fill_faces_by_letter():
+    m = OdontogramState.from_states([(Estado.OBTURACION, 14, "MD")])
+    f = _faces(m.teeth[14])
+    assert f["left"] == f["right"] == FILL_RED           # M / D
+    assert f["top"] == f["bottom"] == f["center"] == FILL_WHITE
+
+
+def test_fill_without_faces_covers_tooth():
+    m = OdontogramState.from_states([(Estado.CARIES, 21, "")])
+    assert m.teeth[21].faces == [FILL_BLUE] * 5
+
+
+def test_agenesia_and_clear():
+    m = OdontogramState.from_states([(Estado.AGENESIA, 11, ""), (Estado.CORONA, 11, "")])
+    assert m.teeth[11].faces == [FILL_GRAY] * 5
+    assert m.teeth[11].overlays == OV_CORONA
+    m.apply_batch([(Estado.NINGUNO, 11, "")])
+    assert m.teeth[11] == ToothState()
+
+
+def test_pd_dominates_extraction():
+    m = OdontogramState.from_states([(Estado.PD_AUSENTE, 17, ""), (Estado.EXTRACCION, 17, "")])
+    assert m.teeth[17].lines == LINES_PD
+    m = OdontogramState.from_states([(Estado.EXTRACCION, 16, "")])
+    assert m.teeth[16].lines == LINES_EXT
+    assert OdontogramState().teeth[16].lines == LINES_NONE
+
+
+def test_prosthesis_labels_by_colour():
+    m = OdontogramState.from_states([
+        (Estado.PRS_R, 15, ""), (Estado.PRS_R, 15, ""), (Estado.PCS_B, 15, ""),
+    ])
+    t = m.teeth[15]
+    assert t.labels_red == ["PRS"]                       # sin duplicar
+    assert t.labels_blue == ["PCS"]
+
+
+def test_bridge_and_diff():
+    m = OdontogramState.from_states([(Estado.PUENTE, 13, ""), (Estado.PUENTE, 12, "")])
+    assert m.bridged() == [13, 12]                       # orden de layout
+    assert sorted(m.diff(OdontogramState())) == [12, 13]
+    assert m.copy() == m
+
+
+def test_unknown_code_and_tooth_are_reported(caplog):
+    m = OdontogramState()
+    bad = [(99, 11, ""), (Estado.OBTURACION, 19, "")]
+    with caplog.at_level("WARNING"):
+        skipped = m.apply_batch(bad + [(Estado.AUSENTE_FISIOLOGICO, 11, "")])
+    assert skipped == bad
+    assert m.teeth[11].overlays == OV_AUSENTE
+    assert len(caplog.records) == 1                      # un solo resumen
+    assert "[99]" in caplog.text and "[19]" in caplog.text
+    assert OdontogramState().apply_batch([(Estado.CARIES, 21, "")]) == []
+
+
+def test_unknown_name_returns_false(caplog):
+    with caplog.at_level("WARNING"):
+        assert ToothState().apply("Inexistente") is False
+    assert "Inexistente" in caplog.text
+
+
+def test_name_and_code_paths_agree():
+    for name, code in ESTADOS.items():
+        by_name, by_code = ToothState(), ToothState()
+        by_name.apply(name, faces="V")
+        by_code.apply_code(code, faces="V")
+        assert by_name == by_code, name
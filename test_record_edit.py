@@ -0,0 +1,105 @@
+# test_record_edit.py
+# coding: utf-8
+"""
+Ida y vuelta de la edición por clic (OdontogramView.record_edit).
+
+    python -m pytest -q test_record_edit.py
+
+Corre sin display (QT_QPA_PLATFORM=offscreen).
+"""
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QPointF, Qt
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication
+
+_APP = QApplication.instance() or QApplication([])
+
+from Modules.modelos_sin_imagenes import OdontogramView
+from Modules.odontogram_state import FACE_INDEX, FILL_RED, FILL_WHITE
+from Modules.tooth_index import TOOTH_INFO
+from Utils.sp_data_parse import encode_dientes, parse_dientes_sp
+
+# punto local (x, y) dentro de cada cara de una pieza de 40 px
+_OFF = {"top": (20, 4), "left": (4, 20), "center": (20, 20),
+        "right": (36, 20), "bottom": (20, 36)}
+
+
+def _view(raw: str) -> OdontogramView:
+    v = OdontogramView(locked=False)
+    v.resize(900, 600)
+    v.show()
+    v.apply_batch_states(parse_dientes_sp(raw))
+    v.set_current_state("Obturacion")
+    _APP.processEvents()
+    return v
+
+
+def _click(v: OdontogramView, num: int, face: str) -> None:
+    info = TOOTH_INFO[num]
+    dx, dy = _OFF[face]
+    QTest.mouseClick(v.viewport(), Qt.LeftButton,
+                     pos=v.mapFromScene(QPointF(info.x + dx, info.y + dy)))
+    _APP.processEvents()
+
+
+def _assert_reload_matches(v: OdontogramView) -> None:
+    """Recargar lo guardado reproduce color por cara y estado de cada pieza."""
+    again = _view(v.to_dientes())
+    shown = v.model.copy()
+    for st in shown.teeth.values():
+        st.selected = 0                   # la selección a mano no se guarda
+    assert again.model == shown, again.model.diff(shown)
+    assert again.to_dientes() == v.to_dientes()
+
+
+def test_click_keeps_loaded_obturation():
+    v = _view("114MD")
+    _click(v, 14, "top")
+    assert v.to_dientes() == "114MDV"
+    assert v.model.teeth[14].faces[FACE_INDEX["top"]] == FILL_RED
+    _assert_reload_matches(v)
+
+
+def test_reload_matches_mixed_edits():
+    v = _view("114MD,1312M,821")
+    _click(v, 14, "left")                 # cara ya obturada: se marca
+    _click(v, 12, "center")
+    _click(v, 36, "top")                  # pieza sin estados previos
+    _click(v, 36, "right")
+    _click(v, 36, "right")                # y desmarcada
+    _assert_reload_matches(v)
+
+
+def test_click_twice_removes_only_that_face():
+    v = _view("114MD")
+    _click(v, 14, "top")
+    _click(v, 14, "top")
+    assert v.to_dientes() == "114MD"
+
+
+def test_unselecting_loaded_face_drops_it():
+    v = _view("114MD")
+    _click(v, 14, "left")                 # M: se marca, sigue obturada (roja)
+    assert v.to_dientes() == "114MD"
+    _click(v, 14, "left")                 # M: se desmarca → blanca
+    assert v.model.teeth[14].faces[FACE_INDEX["left"]] == FILL_WHITE
+    assert v.to_dientes() == "114D"
+
+
+def test_edit_after_restore_keeps_cached_model():
+    from Modules.boca_cache import BocaCache
+    v = _view("114MD,1312")
+    cache = BocaCache()
+    snap = cache.put(1, 0, v.freeze_model(), v.states)
+    before = snap.model.copy()
+    v.apply_batch_states(parse_dientes_sp("121"))
+    v.restore(snap.model, snap.states)
+    assert v.model is snap.model                          # sin copia al restaurar
+    _click(v, 14, "top")
+    _click(v, 12, "center")
+    assert v.model is not snap.model
+    assert snap.model == before                           # el cache no se tocó
+    assert v.to_dientes() != encode_dientes(snap.states)
@@ -0,0 +1,31 @@
+"""
+El registro de estilos no se altera al mutar lo que devuelven los accesores.
+"""
+from PyQt5.QtCore import Qt
+
+from Styles.style_models import BLUE_PEN, brush, font, pen
+
+
+def test_mutating_returned_pen_leaves_registry_unchanged():
+    p = pen("outline")
+    p.setWidth(9)
+    p.setColor(Qt.green)
+    again = pen("outline")
+    assert again.width() == 2 and again.color() == Qt.black
+    assert pen("outline") == again                       # mismo valor en cada llamada
+
+
+def test_mutating_brush_font_and_constants_is_local():
+    b = brush("red")
+    b.setColor(Qt.green)
+    assert brush("red").color() == Qt.red
+
+    f = font("implant")
+    f.setPointSize(30)
+    assert font("implant").pointSize() == 10
+
+    BLUE_PEN.setWidth(7)
+    try:
+        assert pen("blue").width() == 3
+    finally:
+        BLUE_PEN.setWidth(3)
@@ -0,0 +1,37 @@
+# test_tooth_geometry.py
+# coding: utf-8
+"""
+Hit-testing por tablas (Modules.tooth_geometry.hit), sin Qt.
+
+    python -m pytest -q test_tooth_geometry.py
+"""
+from Modules import tooth_geometry as tg
+from Modules import tooth_index as ti
+from Modules.odontogram_state import FACE_INDEX, FACE_NAMES
+
+# punto local (x, y) dentro de cada cara de una pieza de 40 px
+_OFF = {"top": (20, 4), "left": (4, 20), "center": (20, 20),
+        "right": (36, 20), "bottom": (20, 36)}
+
+
+def test_every_face_of_every_tooth():
+    for num, info in ti.TOOTH_INFO.items():
+        for face, (dx, dy) in _OFF.items():
+            assert tg.hit(info.x + dx, info.y + dy) == (num, FACE_INDEX[face]), (num, face)
+
+
+def test_polygon_centroids_hit_their_face():
+    for num in ti.FDI_NUMBERS:
+        for i in range(len(FACE_NAMES)):
+            pts = tg.face_polygon(num, i)
+            cx = sum(x for x, _ in pts) / len(pts)
+            cy = sum(y for _, y in pts) / len(pts)
+            assert tg.hit(cx, cy) == (num, i)
+
+
+def test_misses():
+    info = ti.TOOTH_INFO[14]
+    assert tg.hit(info.x + tg.TOOTH_SIZE + 5, info.y + 20) == (0, -1)   # entre piezas
+    assert tg.hit(info.x + 20, info.y - 5) == (0, -1)                    # sobre la fila
+    assert tg.hit(0, 0) == (0, -1)
+    assert tg.hit(-1e6, 1e6) == (0, -1)
@@ -0,0 +1,65 @@
+# test_views_select.py
+# coding: utf-8
+"""
+Selección de bocas en MainWindow: un clic emite currentCellChanged y
+cellClicked; la boca pre-cargada no debe volver a consultarse.
+
+    python -m pytest -q test_views_select.py
+
+Corre sin display (QT_QPA_PLATFORM=offscreen); requiere pyodbc
+(Modules.conexion_db) aunque la consulta se reemplaza.
+"""
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+pytest.importorskip("pyodbc")
+
+from PyQt5.QtWidgets import QApplication
+
+_APP = QApplication.instance() or QApplication([])
+
+import Modules.views as views
+from Utils.idle_scheduler import idle_scheduler
+
+
+@pytest.fixture
+def window(monkeypatch):
+    calls = []
+
+    def fake_data(idboca):
+        calls.append(idboca)
+        return {"credencial": str(idboca), "dientes": "111,212V"}
+
+    monkeypatch.setattr(views, "get_odontograma_data", fake_data)
+    sched = idle_scheduler()
+    monkeypatch.setattr(sched, "idle_ms", 0)
+    w = views.MainWindow({"filas_bocas": [
+        {"idboca": i, "fechacarga": "", "resumenclinico": ""} for i in (1, 2, 3)]})
+    w._prefetch_timer.setInterval(0)
+    yield w, calls
+    sched.clear()
+    w.close()
+
+
+def _settle(w):
+    _APP.processEvents()
+    idle_scheduler().run_pending(timeout_ms=5000)
+    _APP.processEvents()
+
+
+def test_click_on_prefetched_row_makes_no_query(window):
+    w, calls = window
+    w.tableBocas.setCurrentCell(0, 1)
+    w.tableBocas.cellClicked.emit(0, 1)
+    _settle(w)                                     # prefetch de la fila 1
+    assert calls == [1, 2]
+    assert w._prefetched is not None and w._prefetched[0] == 2
+    # un clic real: ambas señales; la segunda no debe rehacer la selección
+    lookups = w._boca_cache.hits + w._boca_cache.misses
+    w.tableBocas.setCurrentCell(1, 1)
+    w.tableBocas.cellClicked.emit(1, 1)
+    assert calls[:2] == [1, 2] and 2 not in calls[2:]
+    assert w._boca_cache.hits + w._boca_cache.misses == lookups + 1
+    assert w.lblCredValue.text() == "2"